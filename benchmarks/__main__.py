@@ -0,0 +1,49 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from importlib import import_module
+
+SUITES = ("import", "llm", "conversation", "asr")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--only", choices=SUITES, action="append")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    results = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "quick": args.quick,
+        },
+        "results": {},
+    }
+    for suite in args.only or SUITES:
+        started = time.perf_counter()
+        results["results"][suite] = import_module(f"benchmarks.bench_{suite}").run(args.quick)
+        print(f"{suite}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    failed = [
+        suite
+        for suite, result in results["results"].items()
+        if not result.get("guard", {}).get("passed", True)
+    ]
+    if failed:
+        print(f"Guards failed: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
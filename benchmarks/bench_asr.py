@@ -0,0 +1,174 @@
+import io
+import math
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import wave
+from typing import Any
+
+from llmtoolkit.asr import OpenAIWhisper
+
+from .stub import StubProvider
+from .utils import time_async_calls, time_calls
+
+SAMPLE_RATE = 16_000
+LONG_AUDIO_HOURS = 2.0
+
+
+def make_wav(seconds: float, frequency: float = 440.0) -> bytes:
+    frames = bytearray()
+    for index in range(int(seconds * SAMPLE_RATE)):
+        gate = 1.0 if int(index / SAMPLE_RATE) % 4 else 0.0
+        value = gate * 0.3 * math.sin(2 * math.pi * frequency * index / SAMPLE_RATE)
+        frames += struct.pack("<h", int(value * 32767))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(SAMPLE_RATE)
+        output.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def make_long_wav(path: str, seconds: float) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "quiet",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate={SAMPLE_RATE}:duration={seconds}",
+            "-ac",
+            "1",
+            path,
+        ],
+        check=True,
+    )
+
+
+def _probe(audio_path: str, entry: str) -> float:
+    return float(
+        subprocess.check_output(
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-show_entries",
+                f"format={entry}",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                audio_path,
+            ]
+        ).strip()
+    )
+
+
+def _split_per_chunk(whisper: OpenAIWhisper, audio_path: str, filetype: str) -> list[str]:
+    bit_rate = _probe(audio_path, "bit_rate")
+    duration = _probe(audio_path, "duration")
+    chunk_duration_s = (whisper._max_file_size * 8.0) / bit_rate * 0.9
+    num_chunks = math.ceil(duration / (chunk_duration_s - whisper._overlap_seconds))
+
+    chunks = []
+    start_time = 0.0
+    for _ in range(num_chunks):
+        end_time = min(start_time + chunk_duration_s, duration)
+        chunk_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{filetype}")
+        chunk_file.close()
+        subprocess.call(
+            [
+                "ffmpeg",
+                "-v",
+                "quiet",
+                "-i",
+                audio_path,
+                "-ss",
+                str(start_time),
+                "-to",
+                str(end_time),
+                "-y",
+                chunk_file.name,
+            ]
+        )
+        chunks.append(chunk_file.name)
+        start_time = end_time - whisper._overlap_seconds
+    return chunks
+
+
+def _split_long_audio(hours: float) -> dict[str, Any]:
+    whisper = OpenAIWhisper(api_key="bench", model_name="bench", use_pipes=False)
+    with tempfile.TemporaryDirectory() as directory:
+        audio_path = os.path.join(directory, "long.wav")
+        make_long_wav(audio_path, hours * 3600)
+
+        def per_chunk() -> None:
+            whisper._cleanup_files(_split_per_chunk(whisper, audio_path, "wav"))
+
+        def single_pass() -> None:
+            chunks, _ = whisper._split_audio(audio_path, "wav")
+            whisper._cleanup_files([chunk for chunk in chunks if chunk != audio_path])
+
+        results = {
+            "hours": hours,
+            "audio_bytes": os.path.getsize(audio_path),
+            "chunks": len(whisper._plan_chunks(audio_path)),
+            "per_chunk_decode": time_calls(per_chunk, 1),
+            "single_pass": time_calls(single_pass, 1),
+        }
+    results["speedup"] = results["per_chunk_decode"]["mean_ms"] / results["single_pass"]["mean_ms"]
+    return results
+
+
+def _whisper(host: str, max_file_size: int, **fields: Any) -> OpenAIWhisper:
+    whisper = OpenAIWhisper(api_key="bench", host=host, model_name="bench", **fields)
+    whisper._max_file_size = max_file_size
+    return whisper
+
+
+def _split(audio: bytes, max_file_size: int, repeat: int) -> dict[str, Any]:
+    results = {}
+    for name, use_pipes in (("pipes", True), ("temp_files", False)):
+        whisper = _whisper(None, max_file_size, use_pipes=use_pipes)
+
+        def prepare(whisper: OpenAIWhisper = whisper) -> None:
+            _, _, temp_files = whisper._prepare_audio_chunks(audio, "wav")
+            whisper._cleanup_files(temp_files)
+
+        results[name] = time_calls(prepare, repeat)
+    return results
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        return {"skipped": "ffmpeg and ffprobe are required"}
+
+    repeat = 3 if quick else 20
+    audio = make_wav(60 if quick else 300)
+    max_file_size = len(audio) // 4
+    results: dict[str, Any] = {
+        "audio_bytes": len(audio),
+        "split": _split(audio, max_file_size, repeat),
+        "split_long_audio": _split_long_audio(0.25 if quick else LONG_AUDIO_HOURS),
+    }
+    with StubProvider(latency=0.05, reply_tokens=64) as stub:
+        for concurrency in (1, 4):
+            whisper = _whisper(stub.openai_host, max_file_size, max_concurrency=concurrency)
+            results[f"transcribe_concurrency_{concurrency}"] = time_calls(
+                lambda whisper=whisper: whisper.transcribe(audio, "wav"), repeat
+            )
+            results[f"atranscribe_concurrency_{concurrency}"] = time_async_calls(
+                lambda whisper=whisper: whisper.atranscribe(audio, "wav"), repeat, 1
+            )
+
+        whisper = _whisper(stub.openai_host, max_file_size, max_concurrency=4)
+        batch = [audio] * (4 if quick else 16)
+        results["transcribe_many"] = time_calls(
+            lambda: list(whisper.transcribe_many(batch, "wav")), 1
+        )
+        results["transcribe_many"]["files"] = len(batch)
+    return results
@@ -0,0 +1,197 @@
+import gc
+import time
+import tracemalloc
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import Any
+
+from llmtoolkit.chain.context import ContextWindowChain
+from llmtoolkit.chain.prompts import UserMessagePromptCoverChain
+from llmtoolkit.conversation import Conversation
+from llmtoolkit.core import Chain
+from llmtoolkit.core.models import (
+    ChainResponse,
+    CompactConversationHistory,
+    ConversationHistory,
+)
+from llmtoolkit.llm import OpenAILLM
+
+from .stub import StubProvider
+from .utils import per_item_us
+
+HISTORY_LENGTHS = (0, 10, 100, 1000)
+HISTORY_CLASSES = (("list", ConversationHistory), ("compact", CompactConversationHistory))
+
+
+class FakeStreamChain(Chain):
+    chunks: int = 1000
+
+    def _chunks(self) -> list[ChainResponse]:
+        chunk = ChainResponse(content="tok ")
+        return [chunk] * self.chunks
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return ChainResponse(content="tok " * self.chunks)
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self.generate(conversation_history)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield from self._chunks()
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        for chunk in self._chunks():
+            yield chunk
+
+
+def _build_history(history_cls: type[ConversationHistory], length: int) -> ConversationHistory:
+    history = history_cls()
+    history.set_system_message("You are a benchmark.")
+    for index in range(length // 2):
+        history.add_user_message(f"Question number {index}: what is the answer?")
+        history.add_assistant_message(f"Answer number {index}: it depends on the context.")
+    return history
+
+
+def _memory_per_conversation(
+    history_cls: type[ConversationHistory], length: int, count: int
+) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    conversations = [
+        Conversation(chain=FakeStreamChain(), history=_build_history(history_cls, length))
+        for _ in range(count)
+    ]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del conversations
+    return used / count
+
+
+def _history_costs(length: int, repeat: int) -> dict[str, Any]:
+    results = {}
+    for name, history_cls in (
+        ("list", ConversationHistory),
+        ("compact", CompactConversationHistory),
+    ):
+        history = _build_history(history_cls, length)
+        history.dump()
+        results[name] = {
+            "dump_us_per_message": per_item_us(history.dump, len(history), repeat),
+            "model_dump_us_per_message": per_item_us(history.model_dump, len(history), repeat),
+            "fork_us": per_item_us(history.fork, 1, repeat),
+        }
+    return results
+
+
+def _stream_overhead(length: int, chunks: int, repeat: int) -> dict[str, Any]:
+    chain = FakeStreamChain(chunks=chunks)
+
+    def raw() -> None:
+        for _ in chain.stream(ConversationHistory()):
+            pass
+
+    instance = Conversation(chain=chain, history=_build_history(ConversationHistory, length))
+
+    def conversation() -> None:
+        for _ in instance.stream("Next question?"):
+            pass
+        instance.history.pop(-1)
+        instance.history.pop(-1)
+
+    raw_us = per_item_us(raw, chunks, repeat)
+    conversation_us = per_item_us(conversation, chunks, repeat)
+    return {
+        "raw_chain_us_per_chunk": raw_us,
+        "conversation_us_per_chunk": conversation_us,
+        "overhead_us_per_chunk": conversation_us - raw_us,
+        "conversation_chunks_per_s": 1_000_000 / conversation_us,
+    }
+
+
+def _stub_stream(lengths: tuple[int, ...], repeat: int) -> dict[str, Any]:
+    results = {}
+    with StubProvider(reply_tokens=256) as stub:
+        llm = OpenAILLM(api_key="bench", host=stub.openai_host, model_name="bench")
+        for length in lengths:
+            conversation = Conversation(
+                chain=llm, history=_build_history(ConversationHistory, length)
+            )
+            tokens, started = 0, time.perf_counter()
+            for _ in range(repeat):
+                for _ in conversation.stream("Next question?"):
+                    tokens += 1
+                conversation.history.pop(-1)
+                conversation.history.pop(-1)
+            results[str(length)] = {"tokens_per_s": tokens / (time.perf_counter() - started)}
+    return results
+
+
+def _cover_chain(lengths: tuple[int, ...], repeat: int) -> dict[str, Any]:
+    def chat_us(make_chain: Callable[[], Chain], length: int) -> float:
+        conversation = Conversation(
+            chain=make_chain(), history=_build_history(ConversationHistory, length)
+        )
+        conversation.chat("Warm up?")
+
+        def turn() -> None:
+            conversation.chat("Next question?")
+            conversation.history.pop(-1)
+            conversation.history.pop(-1)
+
+        return per_item_us(turn, 1, repeat)
+
+    def cover(**kwargs: Any) -> Chain:
+        return UserMessagePromptCoverChain(
+            prompt="Answer carefully: {}", chain=FakeStreamChain(chunks=1), **kwargs
+        )
+
+    results = {}
+    for length in lengths:
+        raw_us = chat_us(lambda: FakeStreamChain(chunks=1), length)
+        chat = chat_us(cover, length)
+        results[str(length)] = {
+            "raw_chat_us": raw_us,
+            "chat_us": chat,
+            "chat_overhead_us": chat - raw_us,
+            "latest_only_chat_us": chat_us(lambda: cover(latest_only=True), length),
+            "cold_chat_us": chat_us(lambda: cover(cache_size=0), length),
+        }
+    return results
+
+
+def _context_window(lengths: tuple[int, ...], repeat: int) -> dict[str, Any]:
+    results = {}
+    for length in lengths:
+        chain = ContextWindowChain(max_tokens=512)
+        history = _build_history(ConversationHistory, length)
+        results[str(length)] = {
+            "prepare_us": per_item_us(lambda: chain._prepare(history.fork()), 1, repeat)
+        }
+    return results
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    repeat = 3 if quick else 20
+    lengths = HISTORY_LENGTHS[:3] if quick else HISTORY_LENGTHS
+    return {
+        "memory_bytes_per_conversation": {
+            str(length): {
+                "list": _memory_per_conversation(ConversationHistory, length, 20),
+                "compact": _memory_per_conversation(CompactConversationHistory, length, 20),
+            }
+            for length in lengths
+        },
+        "history": {str(length): _history_costs(length, repeat) for length in lengths},
+        "stream_overhead": {
+            str(length): _stream_overhead(length, 200 if quick else 4000, repeat)
+            for length in lengths
+        },
+        "stub_stream": _stub_stream(lengths, repeat),
+        "user_message_cover_chain": _cover_chain(lengths, repeat),
+        "context_window_chain": _context_window(lengths, repeat),
+    }
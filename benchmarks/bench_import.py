@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from typing import Any
+
+HEAVY_MODULES = ("httpx", "mistralai", "numpy", "openai", "torch", "whisper")
+
+TARGETS = {
+    "llmtoolkit": ("import llmtoolkit", ()),
+    "core.models": ("from llmtoolkit.core.models import ConversationHistory", ()),
+    "conversation": ("from llmtoolkit import Conversation", ()),
+    "chain": ("import llmtoolkit.chain", ()),
+    "asr": ("import llmtoolkit.asr", ()),
+    "llm.OpenAILLM": ("from llmtoolkit.llm import OpenAILLM", ("openai", "httpx")),
+    "llm.MistralaiLLM": ("from llmtoolkit.llm import MistralaiLLM", ("mistralai", "httpx")),
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) & set({heavy!r}))}}))
+"""
+
+
+def _measure(statement: str) -> tuple[float, list[str]]:
+    output = subprocess.check_output(
+        [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)]
+    )
+    result = json.loads(output)
+    return result["ms"], result["modules"]
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    repeat = 3 if quick else 10
+    targets, unexpected = {}, {}
+    for name, (statement, allowed) in TARGETS.items():
+        timings, modules = [], []
+        for _ in range(repeat):
+            elapsed, modules = _measure(statement)
+            timings.append(elapsed)
+        targets[name] = {"best_ms": min(timings), "heavy_modules": modules}
+        extra = sorted(set(modules) - set(allowed))
+        if extra:
+            unexpected[name] = extra
+    return {"targets": targets, "guard": {"passed": not unexpected, "unexpected": unexpected}}
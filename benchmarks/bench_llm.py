@@ -0,0 +1,90 @@
+import asyncio
+import time
+from typing import Any
+
+from llmtoolkit.core import BaseLLM
+from llmtoolkit.core.models import ConversationHistory
+from llmtoolkit.llm import MistralaiLLM, OpenAILLM
+
+from .stub import StubProvider
+from .utils import latency_stats, time_async_calls, time_calls
+
+
+def _history() -> ConversationHistory:
+    history = ConversationHistory()
+    history.set_system_message("You are a benchmark.")
+    history.add_user_message("Say something.")
+    return history
+
+
+def _stream_stats(llm: BaseLLM, history: ConversationHistory, repeat: int) -> dict[str, Any]:
+    ttfc, totals, chunks = [], [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        first = None
+        for chunk in llm.stream(history):
+            if first is None and chunk.content:
+                first = time.perf_counter() - started
+            chunks += 1
+        totals.append(time.perf_counter() - started)
+        ttfc.append(first or totals[-1])
+    return {
+        "ttfc": latency_stats(ttfc),
+        "total": latency_stats(totals),
+        "chunks_per_s": chunks / sum(totals),
+    }
+
+
+def _astream_stats(
+    llm: BaseLLM, history: ConversationHistory, repeat: int, concurrency: int
+) -> dict[str, Any]:
+    async def run() -> dict[str, Any]:
+        semaphore = asyncio.Semaphore(concurrency)
+        ttfc, totals = [], []
+
+        async def consume() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                first = None
+                async for chunk in llm.astream(history):
+                    if first is None and chunk.content:
+                        first = time.perf_counter() - started
+                totals.append(time.perf_counter() - started)
+                ttfc.append(first or totals[-1])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(consume() for _ in range(repeat)))
+        return {
+            "ttfc": latency_stats(ttfc),
+            "total": latency_stats(totals, time.perf_counter() - started),
+        }
+
+    return asyncio.run(run())
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    repeat = 20 if quick else 200
+    concurrency = 16
+    results: dict[str, Any] = {}
+    with StubProvider(latency=0.005, tokens_per_second=5_000, reply_tokens=32) as stub:
+        providers = {
+            "openai": OpenAILLM(api_key="bench", host=stub.openai_host, model_name="bench"),
+            "mistralai": MistralaiLLM(api_key="bench", host=stub.mistral_host, model_name="bench"),
+        }
+        history = _history()
+        for name, llm in providers.items():
+            results[name] = {
+                "generate": time_calls(lambda llm=llm: llm.generate(history), repeat // 4),
+                "agenerate": time_async_calls(
+                    lambda llm=llm: llm.agenerate(history), repeat, concurrency
+                ),
+                "stream": _stream_stats(llm, history, repeat // 4),
+                "astream": _astream_stats(llm, history, repeat, concurrency),
+            }
+        results["stub"] = {
+            "latency_ms": stub.latency * 1000,
+            "tokens_per_second": stub.tokens_per_second,
+            "reply_tokens": stub.reply_tokens,
+            "requests": stub.requests,
+        }
+    return results
@@ -0,0 +1,111 @@
+import json
+import time
+import uuid
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+
+class StubProvider:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: float | None = None,
+        reply_tokens: int = 32,
+        token: str = "tok ",
+    ) -> None:
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.token = token
+        self.requests = 0
+        self._server = HTTPServer(threaded=True)
+
+    def __enter__(self) -> "StubProvider":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return self._server.url_for("").rstrip("/")
+
+    @property
+    def openai_host(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def mistral_host(self) -> str:
+        return self.url
+
+    def start(self) -> None:
+        self._server.expect_request("/v1/chat/completions").respond_with_handler(self._chat)
+        self._server.expect_request("/v1/audio/transcriptions").respond_with_handler(
+            self._transcription
+        )
+        self._server.start()
+
+    def stop(self) -> None:
+        self._server.clear()
+        if self._server.is_running():
+            self._server.stop()
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _chat(self, request: Request) -> Response:
+        self.requests += 1
+        body = request.get_json()
+        time.sleep(self.latency)
+        if body.get("stream"):
+            return Response(self._chat_stream(body["model"]), content_type="text/event-stream")
+
+        time.sleep(self._token_delay() * self.reply_tokens)
+        payload = {
+            "id": uuid.uuid4().hex,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": self.token * self.reply_tokens},
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+        return Response(json.dumps(payload), content_type="application/json")
+
+    def _chat_stream(self, model: str):
+        delay = self._token_delay()
+        completion_id = uuid.uuid4().hex
+        for index in range(self.reply_tokens + 1):
+            last = index == self.reply_tokens
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop" if last else None,
+                        "delta": {"content": "" if last else self.token},
+                    }
+                ],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            if delay and not last:
+                time.sleep(delay)
+        yield "data: [DONE]\n\n"
+
+    def _transcription(self, request: Request) -> Response:
+        self.requests += 1
+        time.sleep(self.latency + self._token_delay() * self.reply_tokens)
+        return Response(
+            json.dumps({"text": (self.token * self.reply_tokens).strip()}),
+            content_type="application/json",
+        )
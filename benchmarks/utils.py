@@ -0,0 +1,60 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+
+def latency_stats(latencies: list[float], elapsed: float | None = None) -> dict[str, Any]:
+    stats = {
+        "count": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+    if elapsed is not None:
+        stats["throughput_per_s"] = len(latencies) / elapsed
+    return stats
+
+
+def time_calls(fn: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_started)
+    return latency_stats(latencies, time.perf_counter() - started)
+
+
+def time_async_calls(
+    fn: Callable[[], Awaitable[Any]], repeat: int, concurrency: int
+) -> dict[str, Any]:
+    async def run() -> dict[str, Any]:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def call() -> None:
+            async with semaphore:
+                call_started = time.perf_counter()
+                await fn()
+                latencies.append(time.perf_counter() - call_started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(repeat)))
+        return latency_stats(latencies, time.perf_counter() - started)
+
+    return asyncio.run(run())
+
+
+def per_item_us(fn: Callable[[], Any], items: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / max(items, 1) * 1_000_000
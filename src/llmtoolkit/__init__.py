@@ -1,4 +1,17 @@
-from .conversation import Conversation
-from .llm import MistralaiLLM, OpenAILLM
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .conversation import Conversation
+    from .llm import MistralaiLLM, OpenAILLM
+
+_LAZY_ATTRIBUTES = {
+    "Conversation": ".conversation",
+    "MistralaiLLM": ".llm",
+    "OpenAILLM": ".llm",
+}
 
 __all__ = ["Conversation", "OpenAILLM", "MistralaiLLM"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), _LAZY_ATTRIBUTES)
@@ -0,0 +1,19 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_attributes(
+    package: str, namespace: dict[str, Any], attributes: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    def __getattr__(name: str) -> Any:
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = namespace[name] = getattr(import_module(module, package), name)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *attributes})
+
+    return __getattr__, __dir__
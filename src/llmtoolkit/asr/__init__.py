@@ -1,3 +1,16 @@
-from .openai_whisper import OpenAIWhisper
+from typing import TYPE_CHECKING
 
-__all__ = ["OpenAIWhisper"]
+from llmtoolkit._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .local_whisper import LocalWhisper
+    from .openai_whisper import OpenAIWhisper
+
+_LAZY_ATTRIBUTES = {
+    "LocalWhisper": ".local_whisper",
+    "OpenAIWhisper": ".openai_whisper",
+}
+
+__all__ = ["LocalWhisper", "OpenAIWhisper"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), _LAZY_ATTRIBUTES)
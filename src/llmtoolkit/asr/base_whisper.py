@@ -2,13 +2,49 @@ import os
 import subprocess
 import tempfile
 from abc import ABC
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO
 
 from llmtoolkit.core import ASRModel
+from llmtoolkit.core.models import ASRResponse, Context
 from llmtoolkit.exc import UnsupportedFormatError
 
+AudioChunk = str | tuple[str, bytes]
+
 
 class BaseWhisper(ASRModel, ABC):
+    use_pipes: bool = True
+
     _ffmpeg_installation_error = "[Errno 2] No such file or directory: 'ffmpeg'"
+    _pipe_formats: dict[str, str] = {
+        "flac": "flac",
+        "mp3": "mp3",
+        "mpga": "mp3",
+        "oga": "ogg",
+        "ogg": "ogg",
+        "wav": "wav",
+        "webm": "webm",
+    }
+
+    def _can_pipe(self, filetype: str) -> bool:
+        return self.use_pipes and filetype in self._pipe_formats
+
+    @staticmethod
+    def _run_ffmpeg_pipe(args: list[str], data: bytes | None = None) -> bytes:
+        return subprocess.run(
+            ["ffmpeg", "-v", "quiet", *args, "pipe:1"],
+            input=data,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+
+    def _read_to_memory(self, audio: str | bytes, filetype: str) -> bytes:
+        if isinstance(audio, str):
+            return self._run_ffmpeg_pipe(["-i", audio, "-f", self._pipe_formats[filetype]])
+        elif isinstance(audio, bytes):
+            return audio
+        raise UnsupportedFormatError
 
     @staticmethod
     def _save_to_temp_file(
@@ -25,6 +61,21 @@ class BaseWhisper(ASRModel, ABC):
             raise UnsupportedFormatError
         return temp_file.name
 
+    @staticmethod
+    @contextmanager
+    def _open_chunk(chunk: AudioChunk) -> Iterator[IO[bytes] | tuple[str, bytes]]:
+        if isinstance(chunk, str):
+            with open(chunk, "rb") as file:
+                yield file
+        else:
+            yield chunk
+
+    @staticmethod
+    def _chunk_response(text: str, start_time: float, end_time: float) -> ASRResponse:
+        return ASRResponse(
+            text=text, context=Context(data={"start_time": start_time, "end_time": end_time})
+        )
+
     @staticmethod
     def _cleanup_files(files: list[str]):
         for file in files:
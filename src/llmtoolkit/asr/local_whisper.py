@@ -1,45 +1,191 @@
-from collections.abc import AsyncGenerator, Generator
-from typing import Any
+import asyncio
+import threading
+import weakref
+from collections.abc import AsyncGenerator, Generator, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import TYPE_CHECKING, Literal
 
-import whisper
-from pydantic import PrivateAttr
+from pydantic import Field, PrivateAttr, model_validator
 
 from llmtoolkit.core import UNSET
-from llmtoolkit.core.models import ASRResponse
-from llmtoolkit.exc import NotImplementedToolkitError
+from llmtoolkit.core.instrumentation import instrumentation
+from llmtoolkit.core.models import ASRBatchResult, ASRResponse
+from llmtoolkit.exc import UnsupportedFormatError
 
 from .base_whisper import BaseWhisper
+from .model_registry import SharedModel, model_registry
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16_000
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, device: str | None) -> None:
+    global _worker_model
+    _worker_model = model_registry.acquire(model_name, device).model
+
+
+def _transcribe_in_worker(samples: "np.ndarray", language: str | None) -> str:
+    return _worker_model.transcribe(samples, language=language)["text"].strip()
 
 
 class LocalWhisper(BaseWhisper):
-    _model = PrivateAttr()
+    stream_chunk_seconds: int = Field(default=30, ge=1)
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = Field(default=1, ge=1)
+    device: str | None = None
 
-    def model_post_init(self, __context: Any) -> None:
-        self._model = whisper.load_model(self.model_name)
+    _shared: SharedModel | None = PrivateAttr(default=None)
+    _release: weakref.finalize | None = PrivateAttr(default=None)
+    _model_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _executor: Executor | None = PrivateAttr(default=None)
+    _backlog: int = PrivateAttr(default=0)
 
-    def transcribe(self, audio: str | bytes, filetype: str, language: str = UNSET) -> ASRResponse:
-        temp_audio_path = self._save_to_temp_file(audio, filetype)
-        try:
-            result = self._model.transcribe(
-                temp_audio_path, language=None if language is UNSET else language
+    @model_validator(mode="after")
+    def _check_workers(self) -> "LocalWhisper":
+        if self.executor == "thread" and self.max_workers > 1:
+            raise ValueError(
+                "Whisper models are not safe to share between threads, "
+                "use executor='process' for max_workers > 1."
             )
-            transcription = result["text"].strip()
+        return self
+
+    @property
+    def backlog(self) -> int:
+        return self._backlog
+
+    def _get_model(self) -> SharedModel:
+        with self._model_lock:
+            if self._shared is None:
+                self._shared = model_registry.acquire(self.model_name, self.device)
+                self._release = weakref.finalize(
+                    self, model_registry.release_later, self.model_name, self.device
+                )
+            return self._shared
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.device),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        with self._model_lock:
+            if self._release is not None and self._release.detach() is not None:
+                model_registry.release(self.model_name, self.device)
+            self._release = None
+            self._shared = None
+
+    def _decode_audio(self, audio: str | bytes) -> "np.ndarray":
+        import numpy as np
+
+        if isinstance(audio, str):
+            source, data = audio, None
+        elif isinstance(audio, bytes):
+            source, data = "pipe:0", audio
+        else:
+            raise UnsupportedFormatError
+        pcm = self._run_ffmpeg_pipe(
+            ["-i", source, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE)], data
+        )
+        return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+    def _load_audio(self, audio: str | bytes, filetype: str) -> "np.ndarray":
+        with instrumentation.phase("ffmpeg"):
+            if self._can_pipe(filetype):
+                return self._decode_audio(audio)
+
+            import whisper
+
+            temp_audio_path = self._save_to_temp_file(audio, filetype)
+            try:
+                return whisper.load_audio(temp_audio_path)
+            finally:
+                self._cleanup_files([temp_audio_path])
+
+    def _iter_windows(self, samples: "np.ndarray") -> Iterator[tuple["np.ndarray", float, float]]:
+        window = self.stream_chunk_seconds * SAMPLE_RATE
+        for start in range(0, max(len(samples), 1), window):
+            chunk = samples[start : start + window]
+            yield chunk, start / SAMPLE_RATE, (start + len(chunk)) / SAMPLE_RATE
+
+    def _transcribe_samples(self, samples: "np.ndarray", language: str = UNSET) -> str:
+        shared = self._get_model()
+        with shared.lock, instrumentation.phase("inference"):
+            result = shared.model.transcribe(
+                samples, language=None if language is UNSET else language
+            )
+        return result["text"].strip()
+
+    async def _atranscribe_samples(self, samples: "np.ndarray", language: str = UNSET) -> str:
+        loop = asyncio.get_running_loop()
+        self._backlog += 1
+        try:
+            if self.executor == "process":
+                language = None if language is UNSET else language
+                call = partial(_transcribe_in_worker, samples, language)
+                with instrumentation.phase("inference"):
+                    return await loop.run_in_executor(self._get_executor(), call)
+            call = partial(copy_context().run, self._transcribe_samples, samples, language)
+            return await loop.run_in_executor(self._get_executor(), call)
         finally:
-            self._cleanup_files([temp_audio_path])
+            self._backlog -= 1
 
-        return ASRResponse(text=transcription)
+    def transcribe(self, audio: str | bytes, filetype: str, language: str = UNSET) -> ASRResponse:
+        samples = self._load_audio(audio, filetype)
+        return ASRResponse(text=self._transcribe_samples(samples, language))
 
     async def atranscribe(
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> ASRResponse:
-        return self.transcribe(audio, filetype, language)
+        samples = await asyncio.to_thread(self._load_audio, audio, filetype)
+        return ASRResponse(text=await self._atranscribe_samples(samples, language))
 
     def stream(
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> Generator[ASRResponse, None, None]:
-        raise NotImplementedToolkitError
+        samples = self._load_audio(audio, filetype)
+        for chunk, start_time, end_time in self._iter_windows(samples):
+            yield self._chunk_response(
+                self._transcribe_samples(chunk, language), start_time, end_time
+            )
 
     async def astream(
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> AsyncGenerator[ASRResponse, None]:
-        raise NotImplementedToolkitError
+        samples = await asyncio.to_thread(self._load_audio, audio, filetype)
+        for chunk, start_time, end_time in self._iter_windows(samples):
+            yield self._chunk_response(
+                await self._atranscribe_samples(chunk, language), start_time, end_time
+            )
+
+    def transcribe_many(
+        self, audios: Sequence[str | bytes], filetype: str, language: str = UNSET
+    ) -> Generator[ASRBatchResult, None, None]:
+        audios = list(audios)
+        with ThreadPoolExecutor(max_workers=1) as decoder:
+            next_load = decoder.submit(self._load_audio, audios[0], filetype) if audios else None
+            for index in range(len(audios)):
+                load = next_load
+                if index + 1 < len(audios):
+                    next_load = decoder.submit(self._load_audio, audios[index + 1], filetype)
+                try:
+                    text = self._transcribe_samples(load.result(), language)
+                    result = ASRBatchResult(index=index, response=ASRResponse(text=text))
+                except Exception as e:
+                    result = ASRBatchResult(index=index, error=e)
+                yield result
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any
+
+ModelKey = tuple[str, str | None]
+
+
+class SharedModel:
+    __slots__ = ("lock", "model", "refcount", "size")
+
+    def __init__(self, model: Any, size: int) -> None:
+        self.model = model
+        self.size = size
+        self.refcount = 0
+        self.lock = threading.Lock()
+
+
+class WhisperModelRegistry:
+    def __init__(self, memory_budget: int | None = None) -> None:
+        self.memory_budget = memory_budget
+        self._models: OrderedDict[ModelKey, SharedModel] = OrderedDict()
+        self._loading: dict[ModelKey, Future[SharedModel]] = {}
+        self._pending: deque[ModelKey] = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _model_size(model: Any) -> int:
+        return sum(param.numel() * param.element_size() for param in model.parameters())
+
+    @property
+    def memory_usage(self) -> int:
+        return sum(shared.size for shared in self._models.values())
+
+    def refcount(self, model_name: str, device: str | None = None) -> int:
+        shared = self._models.get((model_name, device))
+        return 0 if shared is None else shared.refcount
+
+    def acquire(self, model_name: str, device: str | None = None) -> SharedModel:
+        key = (model_name, device)
+        while True:
+            with self._lock:
+                self._drain()
+                shared = self._models.get(key)
+                if shared is not None:
+                    self._models.move_to_end(key)
+                    shared.refcount += 1
+                    return shared
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = Future()
+                    break
+            loading.result()
+
+        try:
+            import whisper
+
+            model = whisper.load_model(model_name, device=device)
+            shared = SharedModel(model, self._model_size(model))
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            shared.refcount += 1
+            self._models[key] = shared
+            self._drain()
+            self._evict()
+        loading.set_result(shared)
+        return shared
+
+    def release(self, model_name: str, device: str | None = None) -> None:
+        self._pending.append((model_name, device))
+        with self._lock:
+            self._drain()
+            self._evict()
+
+    def release_later(self, model_name: str, device: str | None = None) -> None:
+        self._pending.append((model_name, device))
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drain()
+                self._evict()
+            finally:
+                self._lock.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._drain()
+            for key in [key for key, shared in self._models.items() if shared.refcount == 0]:
+                del self._models[key]
+
+    def _drain(self) -> None:
+        while self._pending:
+            shared = self._models.get(self._pending.popleft())
+            if shared is not None and shared.refcount > 0:
+                shared.refcount -= 1
+
+    def _evict(self) -> None:
+        if self.memory_budget is None:
+            return
+        usage = self.memory_usage
+        for key, shared in list(self._models.items()):
+            if usage <= self.memory_budget:
+                return
+            if shared.refcount == 0:
+                usage -= shared.size
+                del self._models[key]
+
+
+model_registry = WhisperModelRegistry()
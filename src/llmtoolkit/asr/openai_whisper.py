@@ -1,156 +1,408 @@
-import math
+import asyncio
+import os
+import re
 import subprocess
 import tempfile
-from collections.abc import AsyncGenerator, Generator
-from typing import Any
+from bisect import bisect_right
+from collections.abc import AsyncGenerator, Generator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed, wait
+from contextvars import copy_context
 
 from openai import NOT_GIVEN, AsyncOpenAI, OpenAI
-from pydantic import PrivateAttr
+from pydantic import Field
 
 from llmtoolkit.core import UNSET
-from llmtoolkit.core.models import ASRResponse
-from llmtoolkit.exc import FfmpegError, NotImplementedToolkitError
+from llmtoolkit.core.clients import HTTPClientOptions, openai_clients
+from llmtoolkit.core.instrumentation import instrumentation
+from llmtoolkit.core.models import ASRBatchResult, ASRResponse
+from llmtoolkit.exc import FfmpegError
 
-from .base_whisper import BaseWhisper
+from .base_whisper import AudioChunk, BaseWhisper
+from .stitching import stitch_transcripts, trim_overlap
 
 
 class OpenAIWhisper(BaseWhisper):
     api_key: str = "-"
     host: str | None = None
+    max_concurrency: int = Field(default=4, ge=1)
+    split_on_silence: bool = False
+    http_options: HTTPClientOptions = Field(default_factory=HTTPClientOptions)
 
     _max_file_size: int = 25_000_000
     _overlap_seconds: int = 3
     _silence_threshold: int = -40
+    _min_silence_seconds: float = 0.5
+    _seeking_formats: frozenset[str] = frozenset({"wav"})
 
-    _client: OpenAI = PrivateAttr()
-    _async_client: AsyncOpenAI = PrivateAttr()
+    @property
+    def client(self) -> OpenAI:
+        return openai_clients.get_client(self.api_key, self.host, self.http_options)
 
-    def model_post_init(self, __context: Any) -> None:
-        self._client = OpenAI(api_key=self.api_key, base_url=self.host)
-        self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.host)
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        return openai_clients.get_async_client(self.api_key, self.host, self.http_options)
 
-    @staticmethod
-    def _get_audio_duration(audio_path: str) -> float:
-        return float(
-            subprocess.check_output(
-                [
-                    "ffprobe",
-                    "-v",
-                    "quiet",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "default=noprint_wrappers=1:nokey=1",
-                    audio_path,
-                ]
-            ).strip()
+    def _can_pipe(self, filetype: str) -> bool:
+        return (
+            os.name == "posix"
+            and filetype not in self._seeking_formats
+            and super()._can_pipe(filetype)
         )
 
     @staticmethod
-    def _get_bit_rate(audio_path: str) -> float:
-        return float(
-            subprocess.check_output(
-                [
-                    "ffprobe",
-                    "-v",
-                    "quiet",
-                    "-show_entries",
-                    "format=bit_rate",
-                    "-of",
-                    "default=noprint_wrappers=1:nokey=1",
-                    audio_path,
-                ]
-            ).strip()
+    def _probe_audio(audio_path: str) -> tuple[float, float]:
+        output = subprocess.check_output(
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-show_entries",
+                "format=bit_rate,duration",
+                "-of",
+                "default=noprint_wrappers=1",
+                audio_path,
+            ]
         )
+        fields = dict(line.split("=", 1) for line in output.decode().split())
+        return float(fields["bit_rate"]), float(fields["duration"])
+
+    @staticmethod
+    def _probe_pipe(data: bytes) -> tuple[float, float]:
+        output = subprocess.run(
+            [
+                "ffmpeg",
+                "-v",
+                "quiet",
+                "-nostats",
+                "-i",
+                "pipe:0",
+                "-map",
+                "0:a:0",
+                "-c",
+                "copy",
+                "-f",
+                "null",
+                "-progress",
+                "pipe:1",
+                "-",
+            ],
+            input=data,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        fields = dict(line.split("=", 1) for line in output.decode().splitlines())
+        duration = int(fields["out_time_us"]) / 1_000_000
+        return (len(data) * 8 / duration if duration else 0.0), duration
+
+    def _detect_silences(self, audio_path: str, data: bytes | None = None) -> list[float]:
+        output = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-i",
+                audio_path,
+                "-af",
+                f"silencedetect=noise={self._silence_threshold}dB:d={self._min_silence_seconds}",
+                "-f",
+                "null",
+                "-",
+            ],
+            input=data,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        ).stderr.decode()
 
-    def _split_audio(self, audio_path: str, filetype: str) -> list[str]:
-        bit_rate = self._get_bit_rate(audio_path)
-        duration = self._get_audio_duration(audio_path)
+        starts = re.findall(r"silence_start: (-?[\d.]+)", output)
+        ends = re.findall(r"silence_end: (-?[\d.]+)", output)
+        return [(float(start) + float(end)) / 2 for start, end in zip(starts, ends)]
 
+    def _plan_chunks(self, audio_path: str, data: bytes | None = None) -> list[tuple[float, float]]:
+        if data is None:
+            bit_rate, duration = self._probe_audio(audio_path)
+        else:
+            bit_rate, duration = self._probe_pipe(data)
+        if bit_rate * duration <= self._max_file_size * 8.0 * 0.9:
+            return [(0.0, duration)]
         chunk_duration_s = (self._max_file_size * 8.0) / bit_rate * 0.9
-        num_chunks = math.ceil(duration / (chunk_duration_s - self._overlap_seconds))
 
-        chunks = []
-        start_time = 0
+        silences = self._detect_silences(audio_path, data) if self.split_on_silence else []
 
-        for i in range(num_chunks):
+        bounds = []
+        start_time = 0.0
+        while True:
             end_time = min(start_time + chunk_duration_s, duration)
+            if end_time >= duration:
+                bounds.append((start_time, end_time))
+                return bounds
+
+            silence_index = bisect_right(silences, end_time) - 1
+            if silence_index >= 0 and silences[silence_index] > start_time + chunk_duration_s / 2:
+                bounds.append((start_time, silences[silence_index]))
+                start_time = silences[silence_index]
+            else:
+                bounds.append((start_time, end_time))
+                start_time = end_time - self._overlap_seconds
+
+    @staticmethod
+    def _cut_args(bounds: list[tuple[float, float]]) -> list[list[str]]:
+        args = [["-ss", str(start_time), "-to", str(end_time)] for start_time, end_time in bounds]
+        args[-1] = args[-1][:2]
+        return args
+
+    def _split_audio(
+        self, audio_path: str, filetype: str
+    ) -> tuple[list[str], list[tuple[float, float]]]:
+        bounds = self._plan_chunks(audio_path)
+        if len(bounds) == 1:
+            return [audio_path], bounds
+
+        chunks = []
+        command = ["ffmpeg", "-v", "quiet", "-y", "-i", audio_path]
+        for cut_args in self._cut_args(bounds):
             chunk_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{filetype}")
-            subprocess.call(
-                [
-                    "ffmpeg",
-                    "-i",
-                    audio_path,
-                    "-ss",
-                    str(start_time),
-                    "-to",
-                    str(end_time),
-                    "-y",
-                    chunk_file.name,
-                ]
-            )
+            chunk_file.close()
+            command += [*cut_args, "-c", "copy", chunk_file.name]
             chunks.append(chunk_file.name)
-            start_time = end_time - self._overlap_seconds
+        subprocess.call(command)
+
+        return chunks, bounds
 
-        return chunks
+    def _split_audio_in_memory(
+        self, data: bytes, filetype: str
+    ) -> tuple[list[tuple[str, bytes]], list[tuple[float, float]]]:
+        bounds = self._plan_chunks("pipe:0", data)
+        if len(bounds) == 1:
+            return [(f"audio.{filetype}", data)], bounds
+
+        pipes = [os.pipe() for _ in bounds]
+        outputs = [os.fdopen(read_fd, "rb") for read_fd, _ in pipes]
+        command = ["ffmpeg", "-v", "quiet", "-i", "pipe:0"]
+        for cut_args, (_, write_fd) in zip(self._cut_args(bounds), pipes):
+            command += [*cut_args, "-c", "copy", "-f", self._pipe_formats[filetype]]
+            command.append(f"pipe:{write_fd}")
+
+        try:
+            try:
+                process = subprocess.Popen(
+                    command, stdin=subprocess.PIPE, pass_fds=[write_fd for _, write_fd in pipes]
+                )
+            finally:
+                for _, write_fd in pipes:
+                    os.close(write_fd)
+            with ThreadPoolExecutor(max_workers=len(outputs)) as readers:
+                reads = [readers.submit(output.read) for output in outputs]
+                process.communicate(data)
+                chunks = [(f"chunk_{i}.{filetype}", read.result()) for i, read in enumerate(reads)]
+        finally:
+            for output in outputs:
+                output.close()
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        return chunks, bounds
 
     def _prepare_audio_chunks(
         self, audio: str | bytes, filetype: str
-    ) -> tuple[list[str], list[str]]:
+    ) -> tuple[list[AudioChunk], list[tuple[float, float]], list[str]]:
         try:
-            temp_audio_path = self._save_to_temp_file(audio, filetype)
-            chunks = self._split_audio(temp_audio_path, filetype)
-            temp_files = [temp_audio_path] + chunks
-            return chunks, temp_files
+            with instrumentation.phase("ffmpeg"):
+                if self._can_pipe(filetype):
+                    data = self._read_to_memory(audio, filetype)
+                    chunks, bounds = self._split_audio_in_memory(data, filetype)
+                    return chunks, bounds, []
+                temp_audio_path = self._save_to_temp_file(audio, filetype)
+                chunks, bounds = self._split_audio(temp_audio_path, filetype)
+                temp_files = list(dict.fromkeys([temp_audio_path, *chunks]))
+                return chunks, bounds, temp_files
         except FileNotFoundError as e:
             if self._ffmpeg_installation_error in str(e):
                 raise FfmpegError
             raise e
 
-    def transcribe(self, audio: str | bytes, filetype: str, language: str = UNSET) -> ASRResponse:
-        chunks, temp_files = self._prepare_audio_chunks(audio, filetype)
+    def _transcribe_chunk(self, chunk: AudioChunk, language: str = UNSET) -> str:
+        with self._open_chunk(chunk) as file, instrumentation.phase("upload"):
+            transcription = self.client.audio.transcriptions.create(
+                model=self.model_name,
+                file=file,
+                language=NOT_GIVEN if language is UNSET else language,
+            )
+        return transcription.text.strip()
 
-        full_transcription = ""
+    async def _atranscribe_chunk(
+        self, chunk: AudioChunk, semaphore: asyncio.Semaphore, language: str = UNSET
+    ) -> str:
+        async with semaphore:
+            with self._open_chunk(chunk) as file, instrumentation.phase("upload"):
+                transcription = await self.async_client.audio.transcriptions.create(
+                    model=self.model_name,
+                    file=file,
+                    language=NOT_GIVEN if language is UNSET else language,
+                )
+        return transcription.text.strip()
+
+    def _stream_chunks(
+        self,
+        audio: str | bytes,
+        filetype: str,
+        language: str = UNSET,
+        shared_pool: Executor | None = None,
+    ) -> Generator[ASRResponse, None, None]:
+        chunks, bounds, temp_files = self._prepare_audio_chunks(audio, filetype)
+
+        pool = shared_pool or ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks)))
+        futures = []
         try:
-            for chunk_path in chunks:
-                with open(chunk_path, "rb") as file:
-                    transcription = self._client.audio.transcriptions.create(
-                        model=self.model_name,
-                        file=file,
-                        language=NOT_GIVEN if language is UNSET else language,
-                    )
-                    full_transcription += transcription.text.strip() + " "
+            futures = [
+                pool.submit(copy_context().run, self._transcribe_chunk, chunk, language)
+                for chunk in chunks
+            ]
+            for future, (start_time, end_time) in zip(futures, bounds):
+                yield self._chunk_response(future.result(), start_time, end_time)
         finally:
+            if shared_pool is None:
+                pool.shutdown(cancel_futures=True)
+            else:
+                for future in futures:
+                    future.cancel()
+                wait(futures)
             self._cleanup_files(temp_files)
 
-        return ASRResponse(text=full_transcription.strip())
-
-    async def atranscribe(
-        self, audio: str | bytes, filetype: str, language: str = UNSET
-    ) -> ASRResponse:
-        chunks, temp_files = self._prepare_audio_chunks(audio, filetype)
+    async def _astream_chunks(
+        self,
+        audio: str | bytes,
+        filetype: str,
+        language: str = UNSET,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> AsyncGenerator[ASRResponse, None]:
+        chunks, bounds, temp_files = await asyncio.to_thread(
+            self._prepare_audio_chunks, audio, filetype
+        )
 
-        full_transcription = ""
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._atranscribe_chunk(chunk, semaphore, language))
+            for chunk in chunks
+        ]
         try:
-            for chunk_path in chunks:
-                with open(chunk_path, "rb") as file:
-                    transcription = await self._async_client.audio.transcriptions.create(
-                        model=self.model_name,
-                        file=file,
-                        language=NOT_GIVEN if language is UNSET else language,
-                    )
-                    full_transcription += transcription.text.strip() + " "
+            for task, (start_time, end_time) in zip(tasks, bounds):
+                yield self._chunk_response(await task, start_time, end_time)
         finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             self._cleanup_files(temp_files)
 
-        return ASRResponse(text=full_transcription.strip())
+    @staticmethod
+    def _segment(response: ASRResponse) -> tuple[str, float, float]:
+        return response.text, response.context.data["start_time"], response.context.data["end_time"]
+
+    @staticmethod
+    def _dedupe_chunk(response: ASRResponse, previous: ASRResponse | None) -> ASRResponse:
+        if (
+            previous is None
+            or response.context.data["start_time"] >= previous.context.data["end_time"]
+        ):
+            return response
+        return response.model_copy(update={"text": trim_overlap(previous.text, response.text)})
+
+    def _transcribe_with(
+        self,
+        uploads: Executor | None,
+        audio: str | bytes,
+        filetype: str,
+        language: str = UNSET,
+    ) -> ASRResponse:
+        segments = [
+            self._segment(response)
+            for response in self._stream_chunks(audio, filetype, language, uploads)
+        ]
+        return ASRResponse(text=stitch_transcripts(segments))
+
+    async def _atranscribe_with(
+        self,
+        uploads: asyncio.Semaphore | None,
+        audio: str | bytes,
+        filetype: str,
+        language: str = UNSET,
+    ) -> ASRResponse:
+        segments = [
+            self._segment(response)
+            async for response in self._astream_chunks(audio, filetype, language, uploads)
+        ]
+        return ASRResponse(text=stitch_transcripts(segments))
+
+    def transcribe(self, audio: str | bytes, filetype: str, language: str = UNSET) -> ASRResponse:
+        return self._transcribe_with(None, audio, filetype, language)
+
+    async def atranscribe(
+        self, audio: str | bytes, filetype: str, language: str = UNSET
+    ) -> ASRResponse:
+        return await self._atranscribe_with(None, audio, filetype, language)
 
     def stream(
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> Generator[ASRResponse, None, None]:
-        raise NotImplementedToolkitError
+        previous = None
+        for response in self._stream_chunks(audio, filetype, language):
+            yield self._dedupe_chunk(response, previous)
+            previous = response
 
     async def astream(
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> AsyncGenerator[ASRResponse, None]:
-        raise NotImplementedToolkitError
+        previous = None
+        async for response in self._astream_chunks(audio, filetype, language):
+            yield self._dedupe_chunk(response, previous)
+            previous = response
+
+    def _transcribe_batch_item(
+        self, uploads: Executor, index: int, audio: str | bytes, filetype: str, language: str
+    ) -> ASRBatchResult:
+        try:
+            response = self._transcribe_with(uploads, audio, filetype, language)
+            return ASRBatchResult(index=index, response=response)
+        except Exception as e:
+            return ASRBatchResult(index=index, error=e)
+
+    def transcribe_many(
+        self, audios: Sequence[str | bytes], filetype: str, language: str = UNSET
+    ) -> Generator[ASRBatchResult, None, None]:
+        items = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        uploads = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            futures = [
+                items.submit(self._transcribe_batch_item, uploads, index, audio, filetype, language)
+                for index, audio in enumerate(audios)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            items.shutdown(cancel_futures=True)
+            uploads.shutdown(cancel_futures=True)
+
+    async def atranscribe_many(
+        self, audios: Sequence[str | bytes], filetype: str, language: str = UNSET
+    ) -> AsyncGenerator[ASRBatchResult, None]:
+        items = asyncio.Semaphore(self.max_concurrency)
+        uploads = asyncio.Semaphore(self.max_concurrency)
+
+        async def transcribe_item(index: int, audio: str | bytes) -> ASRBatchResult:
+            async with items:
+                try:
+                    response = await self._atranscribe_with(uploads, audio, filetype, language)
+                    return ASRBatchResult(index=index, response=response)
+                except Exception as e:
+                    return ASRBatchResult(index=index, error=e)
+
+        tasks = [
+            asyncio.ensure_future(transcribe_item(index, audio))
+            for index, audio in enumerate(audios)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
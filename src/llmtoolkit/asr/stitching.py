@@ -0,0 +1,58 @@
+from collections.abc import Iterable
+
+STITCH_WINDOW = 24
+MIN_OVERLAP_RUN = 3
+
+
+def _normalize(token: str) -> str:
+    return "".join(char for char in token.lower() if char.isalnum())
+
+
+def find_overlap(
+    left: list[str],
+    right: list[str],
+    window: int = STITCH_WINDOW,
+    min_run: int = MIN_OVERLAP_RUN,
+) -> tuple[int, int] | None:
+    tail_start = max(len(left) - window, 0)
+    tail = [_normalize(token) for token in left[tail_start:]]
+    head = [_normalize(token) for token in right[:window]]
+
+    best_run, best_left, best_right = 0, 0, 0
+    previous_row = [0] * (len(head) + 1)
+    for i, left_token in enumerate(tail, start=1):
+        row = [0] * (len(head) + 1)
+        for j, right_token in enumerate(head, start=1):
+            if left_token and left_token == right_token:
+                row[j] = previous_row[j - 1] + 1
+                if row[j] > best_run:
+                    best_run, best_left, best_right = row[j], i, j
+        previous_row = row
+
+    if best_run < min_run:
+        return None
+    return tail_start + best_left, best_right
+
+
+def trim_overlap(previous: str, current: str) -> str:
+    tokens = current.split()
+    overlap = find_overlap(previous.split(), tokens)
+    if overlap is None:
+        return current
+    return " ".join(tokens[overlap[1] :])
+
+
+def stitch_transcripts(segments: Iterable[tuple[str, float, float]]) -> str:
+    tokens: list[str] = []
+    previous_end = 0.0
+    for text, start_time, end_time in segments:
+        chunk_tokens = text.split()
+        overlap = find_overlap(tokens, chunk_tokens) if start_time < previous_end else None
+        previous_end = end_time
+        if overlap is None:
+            tokens.extend(chunk_tokens)
+            continue
+        left_end, right_end = overlap
+        del tokens[left_end:]
+        tokens.extend(chunk_tokens[right_end:])
+    return " ".join(tokens)
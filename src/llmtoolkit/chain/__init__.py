@@ -1,6 +1,25 @@
-from .prompts import PromptChain, SystemPromptChain
+from .cache import CacheChain
+from .context import ContextWindowChain
+from .parallel import ParallelChain
+from .prompts import PromptChain, PromptTemplate, SystemPromptChain
+from .streaming import (
+    CallbackStage,
+    CoalesceStage,
+    StopSequenceStage,
+    StreamPipelineChain,
+    StreamStage,
+)
 
 __all__ = [
+    "CacheChain",
+    "CallbackStage",
+    "CoalesceStage",
+    "ContextWindowChain",
+    "ParallelChain",
     "PromptChain",
+    "PromptTemplate",
+    "StopSequenceStage",
+    "StreamPipelineChain",
+    "StreamStage",
     "SystemPromptChain",
 ]
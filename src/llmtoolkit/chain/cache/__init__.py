@@ -0,0 +1,4 @@
+from .backends import CacheBackend, InMemoryCacheBackend, SQLiteCacheBackend
+from .cache import CacheChain
+
+__all__ = ["CacheBackend", "CacheChain", "InMemoryCacheBackend", "SQLiteCacheBackend"]
@@ -0,0 +1,108 @@
+import hashlib
+import json
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+from pydantic import Field, PrivateAttr
+
+from llmtoolkit.core import UNSET, BaseLLM, Chain
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+from .backends import CacheBackend, InMemoryCacheBackend
+
+
+class CacheChain(Chain):
+    backend: CacheBackend = Field(default_factory=InMemoryCacheBackend)
+    force: bool = False
+
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def _model_name(self) -> str | None:
+        chain = self.chain
+        while chain is not None:
+            if isinstance(chain, BaseLLM):
+                return chain.model_name
+            chain = chain.chain
+        return None
+
+    def _cache_key(
+        self, conversation_history: ConversationHistory, parameters: dict[str, Any]
+    ) -> str | None:
+        if not self.force and parameters.get("temperature") != 0:
+            return None
+        payload = {
+            "model": self._model_name(),
+            "messages": conversation_history.dump(),
+            "parameters": {key: value for key, value in parameters.items() if value is not UNSET},
+        }
+        serialized = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def _lookup(self, key: str | None) -> ChainResponse | None:
+        if key is None:
+            return None
+        cached = self.backend.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return ChainResponse.model_validate_json(cached)
+
+    def _store(self, key: str | None, response: ChainResponse) -> None:
+        if key is not None:
+            self.backend.set(key, response.model_dump_json())
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        key = self._cache_key(conversation_history, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.chain.generate(conversation_history, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        key = self._cache_key(conversation_history, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.chain.agenerate(conversation_history, **kwargs)
+        self._store(key, response)
+        return response
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        key = self._cache_key(conversation_history, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        contents = []
+        for chunk in self.chain.stream(conversation_history, **kwargs):
+            contents.append(chunk.content)
+            yield chunk
+        self._store(key, ChainResponse(content="".join(contents)))
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        key = self._cache_key(conversation_history, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        contents = []
+        async for chunk in self.chain.astream(conversation_history, **kwargs):
+            contents.append(chunk.content)
+            yield chunk
+        self._store(key, ChainResponse(content="".join(contents)))
@@ -0,0 +1,3 @@
+from .context_window import ContextWindowChain, estimate_tokens
+
+__all__ = ["ContextWindowChain", "estimate_tokens"]
@@ -0,0 +1,178 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable, Generator
+
+from pydantic import Field, PrivateAttr
+
+from llmtoolkit.core import Chain
+from llmtoolkit.core.enums import Roles
+from llmtoolkit.core.instrumentation import instrumentation
+from llmtoolkit.core.models import ChainResponse, ConversationHistory, ConversationMessage
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+class ContextWindowChain(Chain):
+    max_tokens: int = Field(gt=0)
+    message_overhead: int = 4
+    token_counter: Callable[[str], int] = estimate_tokens
+    summarizer: Chain | None = None
+    summary_tokens: int | None = Field(default=None, gt=0)
+    summary_prompt: str = (
+        "Summarize the conversation above in a few sentences. "
+        "Keep every fact needed to continue it."
+    )
+    cache_size: int = 10_000
+
+    _token_cache: OrderedDict[str, int] = PrivateAttr(default_factory=OrderedDict)
+    _summary_cache: OrderedDict[bytes, str] = PrivateAttr(default_factory=OrderedDict)
+
+    def count_tokens(self, content: str) -> int:
+        count = self._token_cache.get(content)
+        if count is None:
+            count = self._token_cache[content] = self.token_counter(content)
+            if len(self._token_cache) > self.cache_size:
+                self._token_cache.popitem(last=False)
+        return count + self.message_overhead
+
+    @property
+    def summary_budget(self) -> int:
+        return self.max_tokens // 4 if self.summary_tokens is None else self.summary_tokens
+
+    def _split(
+        self, conversation_history: ConversationHistory, reserved: int = 0
+    ) -> tuple[int, list[ConversationMessage], int]:
+        messages = list(conversation_history)
+        offset = 1 if messages and messages[0].role == Roles.SYSTEM.value else 0
+        head = sum(self.count_tokens(message.content) for message in messages[:offset])
+        budget = self.max_tokens - reserved - head
+
+        rest = messages[offset:]
+        total = sum(self.count_tokens(message.content) for message in rest)
+        start = 0
+        while total > budget and start < len(rest) - 1:
+            total -= self.count_tokens(rest[start].content)
+            start += 1
+        while start < len(rest) - 1 and rest[start].role != Roles.USER.value:
+            total -= self.count_tokens(rest[start].content)
+            start += 1
+        return offset, rest[:start], head + total
+
+    def _fit_summary(
+        self, conversation_history: ConversationHistory, offset: int, summary: str, used: int
+    ) -> str:
+        head = conversation_history[0].content if offset else None
+        available = self.max_tokens - used + (self.count_tokens(head) if offset else 0)
+
+        def fits(length: int) -> bool:
+            content = summary[:length] if head is None else f"{head}\n\n{summary[:length]}"
+            return self.token_counter(content) + self.message_overhead <= available
+
+        if fits(len(summary)):
+            return summary
+        low, high = 0, len(summary)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return summary[:low].rstrip()
+
+    def _trim(
+        self,
+        conversation_history: ConversationHistory,
+        offset: int,
+        dropped: list[ConversationMessage],
+        summary: str | None = None,
+    ) -> ConversationHistory:
+        del conversation_history.messages[offset : offset + len(dropped)]
+        if not summary:
+            return conversation_history
+        if offset:
+            content = f"{conversation_history[0].content}\n\n{summary}"
+            conversation_history.update_message(0, content=content)
+        else:
+            conversation_history.insert(
+                0, ConversationMessage(role=Roles.SYSTEM.value, content=summary)
+            )
+        return conversation_history
+
+    def _summary_request(
+        self, dropped: list[ConversationMessage]
+    ) -> tuple[bytes, str | None, ConversationHistory | None]:
+        keys = []
+        digest = b""
+        for message in dropped:
+            digest = hashlib.sha256(digest + f"{message.role}:{message.content}".encode()).digest()
+            keys.append(digest)
+        if keys[-1] in self._summary_cache:
+            return keys[-1], self._summary_cache[keys[-1]], None
+
+        request = ConversationHistory(messages=dropped)
+        for index in range(len(keys) - 2, -1, -1):
+            previous = self._summary_cache.get(keys[index])
+            if previous is not None:
+                request = ConversationHistory(messages=dropped[index + 1 :])
+                request.insert(0, ConversationMessage(role=Roles.SYSTEM.value, content=previous))
+                break
+        request.add_user_message(self.summary_prompt)
+        return keys[-1], None, request
+
+    def _remember_summary(self, key: bytes, summary: str) -> str:
+        self._summary_cache[key] = summary
+        if len(self._summary_cache) > self.cache_size:
+            self._summary_cache.popitem(last=False)
+        return summary
+
+    def _prepare(self, conversation_history: ConversationHistory) -> ConversationHistory:
+        offset, dropped, _ = self._split(conversation_history)
+        if not dropped or self.summarizer is None:
+            return self._trim(conversation_history, offset, dropped)
+
+        offset, dropped, used = self._split(conversation_history, self.summary_budget)
+        key, summary, request = self._summary_request(dropped)
+        if summary is None:
+            summary = self._remember_summary(key, self.summarizer.generate(request).content)
+        summary = self._fit_summary(conversation_history, offset, summary, used)
+        return self._trim(conversation_history, offset, dropped, summary)
+
+    async def _aprepare(self, conversation_history: ConversationHistory) -> ConversationHistory:
+        offset, dropped, _ = self._split(conversation_history)
+        if not dropped or self.summarizer is None:
+            return self._trim(conversation_history, offset, dropped)
+
+        offset, dropped, used = self._split(conversation_history, self.summary_budget)
+        key, summary, request = self._summary_request(dropped)
+        if summary is None:
+            response = await self.summarizer.agenerate(request)
+            summary = self._remember_summary(key, response.content)
+        summary = self._fit_summary(conversation_history, offset, summary, used)
+        return self._trim(conversation_history, offset, dropped, summary)
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
+        return self.chain.generate(conversation_history, **kwargs)
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        with instrumentation.phase("prepare"):
+            conversation_history = await self._aprepare(conversation_history)
+        return await self.chain.agenerate(conversation_history, **kwargs)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
+        yield from self.chain.stream(conversation_history, **kwargs)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        with instrumentation.phase("prepare"):
+            conversation_history = await self._aprepare(conversation_history)
+        async for chunk in self.chain.astream(conversation_history, **kwargs):
+            yield chunk
@@ -0,0 +1,3 @@
+from .parallel import ParallelChain
+
+__all__ = ["ParallelChain"]
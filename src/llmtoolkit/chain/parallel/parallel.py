@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any
+
+from pydantic import Field
+
+from llmtoolkit.core import Chain
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+BranchResult = ChainResponse | BaseException
+
+
+class ParallelChain(Chain):
+    branches: dict[str, Chain] = Field(min_length=1)
+    timeout: float | None = Field(default=None, gt=0)
+    first_completed: bool = False
+    separator: str = "\n\n"
+    max_workers: int | None = Field(default=None, ge=1)
+
+    @staticmethod
+    def _branch_metadata(result: BranchResult | None) -> dict[str, Any]:
+        if result is None:
+            return {"content": None, "metadata": {}, "error": "CancelledError"}
+        if isinstance(result, BaseException):
+            return {"content": None, "metadata": {}, "error": repr(result)}
+        return {"content": result.content, "metadata": result.metadata, "error": None}
+
+    def _merge(self, results: dict[str, BranchResult], winner: str | None = None) -> ChainResponse:
+        successes = {
+            name: result for name, result in results.items() if isinstance(result, ChainResponse)
+        }
+        if not successes:
+            raise next(iter(results.values()))
+
+        if winner is not None:
+            content = successes[winner].content
+        else:
+            content = self.separator.join(
+                successes[name].content for name in self.branches if name in successes
+            )
+        metadata: dict[str, Any] = {
+            "branches": {name: self._branch_metadata(results.get(name)) for name in self.branches}
+        }
+        if winner is not None:
+            metadata["winner"] = winner
+        return ChainResponse(content=content, metadata=metadata)
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or len(self.branches))
+        futures = {
+            executor.submit(chain.generate, conversation_history.fork(), **kwargs): name
+            for name, chain in self.branches.items()
+        }
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        results: dict[str, BranchResult] = {}
+        try:
+            pending = set(futures)
+            while pending:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    name = futures[future]
+                    exception = future.exception()
+                    results[name] = future.result() if exception is None else exception
+                    if self.first_completed and exception is None:
+                        return self._merge(results, winner=name)
+            for future in pending:
+                results[futures[future]] = TimeoutError(f"Branch timed out after {self.timeout}s.")
+            return self._merge(results)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _arun_branch(
+        self, chain: Chain, conversation_history: ConversationHistory, **kwargs
+    ) -> ChainResponse:
+        return await asyncio.wait_for(
+            chain.agenerate(conversation_history.fork(), **kwargs), self.timeout
+        )
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        tasks = {
+            asyncio.ensure_future(self._arun_branch(chain, conversation_history, **kwargs)): name
+            for name, chain in self.branches.items()
+        }
+        results: dict[str, BranchResult] = {}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    exception = task.exception()
+                    results[name] = task.result() if exception is None else exception
+                    if self.first_completed and exception is None:
+                        return self._merge(results, winner=name)
+            return self._merge(results)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield self.generate(conversation_history, **kwargs)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        yield await self.agenerate(conversation_history, **kwargs)
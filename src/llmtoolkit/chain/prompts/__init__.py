@@ -1,5 +1,6 @@
 from .prompt import PromptChain
 from .system_prompt import SystemPromptChain
+from .template import PromptTemplate
 from .user_message_prompt_cover import UserMessagePromptCoverChain
 
-__all__ = ["PromptChain", "SystemPromptChain", "UserMessagePromptCoverChain"]
+__all__ = ["PromptChain", "PromptTemplate", "SystemPromptChain", "UserMessagePromptCoverChain"]
@@ -1,37 +1,68 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+
+from pydantic import Field, PrivateAttr
 
 from llmtoolkit.core import Chain
+from llmtoolkit.core.instrumentation import instrumentation
 from llmtoolkit.core.models import (
     ChainResponse,
     ConversationHistory,
 )
 
+from .template import PromptTemplate
+
 
 class PromptChain(Chain):
-    prompt: str
+    prompt: str | PromptTemplate
+    variables: dict[str, Any] = Field(default_factory=dict)
+
+    _rendered: str = PrivateAttr(default="")
+
+    def model_post_init(self, __context: Any) -> None:
+        if isinstance(self.prompt, str) and not self.variables:
+            self._rendered = self.prompt
+            return
+        template = self._compile()
+        template.check(self.variables)
+        self._rendered = template.render(**self.variables)
 
-    def _prepare(self, conversation_history: ConversationHistory) -> None:
-        conversation_history.add_assistant_message(content=self.prompt)
+    def _compile(self) -> PromptTemplate:
+        if isinstance(self.prompt, PromptTemplate):
+            return self.prompt
+        return PromptTemplate(template=self.prompt)
+
+    @property
+    def rendered_prompt(self) -> str:
+        return self._rendered
+
+    def _prepare(self, conversation_history: ConversationHistory) -> ConversationHistory:
+        conversation_history.add_assistant_message(content=self._rendered)
         return conversation_history
 
     def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
-        conversation_history = self._prepare(conversation_history)
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
         return self.chain.generate(conversation_history, **kwargs)
 
     def stream(
         self, conversation_history: ConversationHistory | None = None, **kwargs
     ) -> Generator[ChainResponse, None, None]:
-        conversation_history = self._prepare(conversation_history)
-        return self.chain.stream(conversation_history, **kwargs)
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
+        yield from self.chain.stream(conversation_history, **kwargs)
 
     async def agenerate(
         self, conversation_history: ConversationHistory | None = None, **kwargs
     ) -> ChainResponse:
-        conversation_history = self._prepare(conversation_history)
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
         return await self.chain.agenerate(conversation_history, **kwargs)
 
     async def astream(
         self, conversation_history: ConversationHistory | None = None, **kwargs
-    ) -> Generator[ChainResponse, None, None]:
-        conversation_history = self._prepare(conversation_history)
-        return self.chain.astream(conversation_history, **kwargs)
+    ) -> AsyncGenerator[ChainResponse, None]:
+        with instrumentation.phase("prepare"):
+            conversation_history = self._prepare(conversation_history)
+        async for chunk in self.chain.astream(conversation_history, **kwargs):
+            yield chunk
@@ -6,8 +6,6 @@ from .prompt import PromptChain
 
 
 class SystemPromptChain(PromptChain):
-    prompt: str
-
     def _prepare(self, conversation_history: ConversationHistory) -> ConversationHistory:
-        conversation_history.set_system_message(content=self.prompt)
+        conversation_history.set_system_message(content=self._rendered)
         return conversation_history
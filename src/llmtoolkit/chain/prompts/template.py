@@ -0,0 +1,102 @@
+from string import Formatter
+from typing import Any
+
+from pydantic import BaseModel, PrivateAttr
+
+from llmtoolkit.exc import PromptTemplateError
+
+TemplatePart = tuple[str, str | None, str | None, str | None]
+
+
+class PromptTemplate(BaseModel):
+    template: str
+
+    _parts: list[TemplatePart] = PrivateAttr(default_factory=list)
+    _variables: frozenset[str] = PrivateAttr(default=frozenset())
+    _positional: int = PrivateAttr(default=0)
+    _static: str | None = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        try:
+            self._parts = list(Formatter().parse(self.template))
+        except ValueError as e:
+            raise PromptTemplateError(f"Invalid prompt template: {e}") from e
+
+        variables, auto, explicit = set(), 0, 0
+        for _, field_name, _, _ in self._parts:
+            if field_name is None:
+                continue
+            root = self._root(field_name)
+            if root == "":
+                auto += 1
+            elif root.isdigit():
+                explicit = max(explicit, int(root) + 1)
+            else:
+                variables.add(root)
+        if auto and explicit:
+            raise PromptTemplateError(
+                "Invalid prompt template: cannot mix automatic and manual field numbering."
+            )
+        self._variables = frozenset(variables)
+        self._positional = auto or explicit
+        if not self._variables and not self._positional:
+            self._static = self.template.format()
+
+    @staticmethod
+    def _root(field_name: str) -> str:
+        for index, char in enumerate(field_name):
+            if char in ".[":
+                return field_name[:index]
+        return field_name
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace("{", "{{").replace("}", "}}")
+
+    @property
+    def variables(self) -> frozenset[str]:
+        return self._variables
+
+    @property
+    def positional(self) -> int:
+        return self._positional
+
+    @property
+    def is_static(self) -> bool:
+        return self._static is not None
+
+    def check(self, variables: dict[str, Any], positional: int = 0) -> None:
+        missing = self._variables - variables.keys()
+        if missing:
+            raise PromptTemplateError(f"Missing prompt variables: {', '.join(sorted(missing))}.")
+        if self._positional > positional:
+            raise PromptTemplateError(
+                f"Prompt template expects {self._positional} positional arguments, "
+                f"got {positional}."
+            )
+
+    def partial(self, **variables: Any) -> "PromptTemplate":
+        if not variables.keys() & self._variables:
+            return self
+        pieces = []
+        for literal, field_name, format_spec, conversion in self._parts:
+            pieces.append(self._escape(literal))
+            if field_name is None:
+                continue
+            if self._root(field_name) in variables:
+                field = f"{{{field_name}{f'!{conversion}' if conversion else ''}:{format_spec}}}"
+                pieces.append(self._escape(field.format(**variables)))
+            else:
+                pieces.append(
+                    f"{{{field_name}{f'!{conversion}' if conversion else ''}"
+                    f"{f':{format_spec}' if format_spec else ''}}}"
+                )
+        return PromptTemplate(template="".join(pieces))
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        if self._static is not None:
+            return self._static
+        try:
+            return self.template.format(*args, **kwargs)
+        except (IndexError, KeyError) as e:
+            raise PromptTemplateError(f"Missing prompt variable: {e}.") from e
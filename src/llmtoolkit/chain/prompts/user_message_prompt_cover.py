@@ -1,18 +1,65 @@
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import PrivateAttr
+
 from llmtoolkit.core.enums import Roles
-from llmtoolkit.core.models import (
-    ConversationHistory,
-)
+from llmtoolkit.core.models import ConversationHistory, ConversationMessage
 
 from .prompt import PromptChain
+from .template import PromptTemplate
 
 
 class UserMessagePromptCoverChain(PromptChain):
-    prompt: str
+    latest_only: bool = False
+    cache_size: int = 10_000
+
+    _wrapped: OrderedDict[str, str] = PrivateAttr(default_factory=OrderedDict)
+    _covers: OrderedDict[int, tuple[weakref.ref[ConversationMessage], ConversationMessage]] = (
+        PrivateAttr(default_factory=OrderedDict)
+    )
+    _marked: weakref.WeakValueDictionary[int, ConversationMessage] = PrivateAttr(
+        default_factory=weakref.WeakValueDictionary
+    )
+    _template: PromptTemplate | None = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        template = self._compile()
+        template.check(self.variables, positional=1)
+        self._template = template.partial(**self.variables)
+
+    def _wrap(self, content: str) -> str:
+        wrapped = self._wrapped.get(content)
+        if wrapped is None:
+            wrapped = self._wrapped[content] = self._template.render(content)
+            if len(self._wrapped) > self.cache_size:
+                self._wrapped.popitem(last=False)
+        else:
+            self._wrapped.move_to_end(content)
+        return wrapped
+
+    def _cover(self, message: ConversationMessage) -> ConversationMessage:
+        cover = message.model_copy(update={"content": self._wrap(message.content)})
+        self._covers[id(message)] = (weakref.ref(message), cover)
+        self._marked[id(cover)] = cover
+        if len(self._covers) > self.cache_size:
+            self._covers.popitem(last=False)
+        return cover
 
     def _prepare(self, conversation_history: ConversationHistory) -> ConversationHistory:
+        covers, marked, user = self._covers, self._marked, Roles.USER.value
         for i in range(len(conversation_history) - 1, -1, -1):
-            if conversation_history[i].role != Roles.USER:
+            message = conversation_history[i]
+            if message.role != user:
                 continue
-            content = conversation_history[i].content
-            conversation_history[i].content = self.prompt.format(content)
+            key = id(message)
+            entry = covers.get(key)
+            if entry is not None and entry[0]() is message:
+                covers.move_to_end(key)
+                conversation_history[i] = entry[1]
+            elif marked.get(key) is not message:
+                conversation_history[i] = self._cover(message)
+            if self.latest_only:
+                break
         return conversation_history
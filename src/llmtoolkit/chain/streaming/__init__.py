@@ -0,0 +1,10 @@
+from .pipeline import StreamPipelineChain
+from .stages import CallbackStage, CoalesceStage, StopSequenceStage, StreamStage
+
+__all__ = [
+    "CallbackStage",
+    "CoalesceStage",
+    "StopSequenceStage",
+    "StreamPipelineChain",
+    "StreamStage",
+]
@@ -0,0 +1,57 @@
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterable, Iterator
+
+from llmtoolkit.core import Chain
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+from .stages import StreamStage
+
+
+class StreamPipelineChain(Chain):
+    stages: list[StreamStage]
+
+    def _merge(self, response: ChainResponse, chunks: Iterable[ChainResponse]) -> ChainResponse:
+        chunks = list(chunks)
+        if not chunks:
+            return response.model_copy(update={"content": ""})
+        return chunks[-1].model_copy(update={"content": "".join(chunk.content for chunk in chunks)})
+
+    @staticmethod
+    async def _aiter(response: ChainResponse) -> AsyncGenerator[ChainResponse, None]:
+        yield response
+
+    def _pipe(self, chunks: Iterator[ChainResponse]) -> Iterator[ChainResponse]:
+        for stage in self.stages:
+            chunks = stage.transform(chunks)
+        return chunks
+
+    def _apipe(self, chunks: AsyncIterator[ChainResponse]) -> AsyncIterator[ChainResponse]:
+        for stage in self.stages:
+            chunks = stage.atransform(chunks)
+        return chunks
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        response = self.chain.generate(conversation_history, **kwargs)
+        return self._merge(response, self._pipe(iter([response])))
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        response = await self.chain.agenerate(conversation_history, **kwargs)
+        return self._merge(response, [chunk async for chunk in self._apipe(self._aiter(response))])
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        source = self.chain.stream(conversation_history, **kwargs)
+        try:
+            yield from self._pipe(source)
+        finally:
+            source.close()
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        source = self.chain.astream(conversation_history, **kwargs)
+        try:
+            async for chunk in self._apipe(source):
+                yield chunk
+        finally:
+            await source.aclose()
@@ -0,0 +1,120 @@
+import inspect
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from llmtoolkit.core.models import ChainResponse
+
+
+class StreamStage(ABC, BaseModel):
+    def _initial_state(self) -> dict[str, Any]:
+        return {}
+
+    @abstractmethod
+    def _feed(self, chunk: ChainResponse, state: dict[str, Any]) -> list[ChainResponse]: ...
+
+    def _flush(self, state: dict[str, Any]) -> list[ChainResponse]:
+        return []
+
+    def transform(self, chunks: Iterator[ChainResponse]) -> Iterator[ChainResponse]:
+        state = self._initial_state()
+        for chunk in chunks:
+            yield from self._feed(chunk, state)
+            if state.get("done"):
+                return
+        yield from self._flush(state)
+
+    async def atransform(
+        self, chunks: AsyncIterator[ChainResponse]
+    ) -> AsyncIterator[ChainResponse]:
+        state = self._initial_state()
+        async for chunk in chunks:
+            for output in self._feed(chunk, state):
+                yield output
+            if state.get("done"):
+                return
+        for output in self._flush(state):
+            yield output
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class CoalesceStage(StreamStage):
+    min_chars: int | None = Field(default=None, ge=1)
+    max_delay_ms: float | None = Field(default=None, gt=0)
+
+    def _initial_state(self) -> dict[str, Any]:
+        return {"parts": [], "size": 0, "started": 0.0, "last": None}
+
+    @staticmethod
+    def _emit(state: dict[str, Any]) -> list[ChainResponse]:
+        if state["last"] is None:
+            return []
+        chunk = state["last"].model_copy(update={"content": "".join(state["parts"])})
+        state.update(parts=[], size=0, last=None)
+        return [chunk]
+
+    def _feed(self, chunk: ChainResponse, state: dict[str, Any]) -> list[ChainResponse]:
+        now = time.monotonic()
+        if state["last"] is None:
+            state["started"] = now
+        state["parts"].append(chunk.content)
+        state["size"] += len(chunk.content)
+        state["last"] = chunk
+        if self.min_chars is not None and state["size"] >= self.min_chars:
+            return self._emit(state)
+        if self.max_delay_ms is not None and (now - state["started"]) * 1000 >= self.max_delay_ms:
+            return self._emit(state)
+        return []
+
+    def _flush(self, state: dict[str, Any]) -> list[ChainResponse]:
+        return self._emit(state)
+
+
+class StopSequenceStage(StreamStage):
+    stop: list[str] = Field(min_length=1)
+
+    def _initial_state(self) -> dict[str, Any]:
+        return {"tail": "", "last": None}
+
+    def _feed(self, chunk: ChainResponse, state: dict[str, Any]) -> list[ChainResponse]:
+        text = state["tail"] + chunk.content
+        state["last"] = chunk
+        matches = [(text.find(stop), stop) for stop in self.stop if stop in text]
+        if matches:
+            index, stop = min(matches)
+            state["done"] = True
+            metadata = {**chunk.metadata, "stop_sequence": stop}
+            return [chunk.model_copy(update={"content": text[:index], "metadata": metadata})]
+
+        split = max(len(text) - max(len(stop) for stop in self.stop) + 1, 0)
+        state["tail"] = text[split:]
+        if split == 0:
+            return []
+        return [chunk.model_copy(update={"content": text[:split]})]
+
+    def _flush(self, state: dict[str, Any]) -> list[ChainResponse]:
+        if not state["tail"]:
+            return []
+        return [state["last"].model_copy(update={"content": state["tail"]})]
+
+
+class CallbackStage(StreamStage):
+    callback: Callable[[ChainResponse], Any]
+
+    def _feed(self, chunk: ChainResponse, state: dict[str, Any]) -> list[ChainResponse]:
+        self.callback(chunk)
+        return [chunk]
+
+    async def atransform(
+        self, chunks: AsyncIterator[ChainResponse]
+    ) -> AsyncIterator[ChainResponse]:
+        async for chunk in chunks:
+            result = self.callback(chunk)
+            if inspect.isawaitable(result):
+                await result
+            yield chunk
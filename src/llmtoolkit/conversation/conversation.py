@@ -1,13 +1,14 @@
 from collections.abc import AsyncGenerator, Generator
 from typing import Any
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from llmtoolkit.core import UNSET
 from llmtoolkit.core.conversation import BaseConversation
 from llmtoolkit.core.models import (
     ChainResponse,
     Context,
+    ConversationHistory,
     GenerationParameters,
 )
 
@@ -15,6 +16,27 @@ from llmtoolkit.core.models import (
 class Conversation(BaseConversation):
     parameters: GenerationParameters = Field(default_factory=GenerationParameters)
 
+    _stream_parts: list[str] | None = PrivateAttr(default=None)
+
+    @property
+    def streaming_content(self) -> str | None:
+        if self._stream_parts is None:
+            return None
+        return "".join(self._stream_parts)
+
+    def _begin_stream(
+        self, prompt: str, context: Context | None
+    ) -> tuple[ConversationHistory, int, list[str]]:
+        self.history.add_user_message(prompt, context)
+        history = self.history.fork()
+        self.history.add_assistant_message("")
+        self._stream_parts = parts = []
+        return history, len(self.history) - 1, parts
+
+    def _finish_stream(self, index: int, parts: list[str]) -> None:
+        self._stream_parts = None
+        self.history.update_message(index, content="".join(parts))
+
     def _merge_generation_params(
         self,
         temperature: float,
@@ -57,7 +79,7 @@ class Conversation(BaseConversation):
             temperature, top_p, frequency_penalty, presence_penalty, max_completion_tokens, stop
         )
         response = self.chain.generate(
-            conversation_history=self.history.copy(deep=True),
+            conversation_history=self.history.fork(),
             **generation_params,
             **kwargs,
         )
@@ -82,7 +104,7 @@ class Conversation(BaseConversation):
             temperature, top_p, frequency_penalty, presence_penalty, max_completion_tokens, stop
         )
         response = await self.chain.agenerate(
-            conversation_history=self.history.copy(deep=True),
+            conversation_history=self.history.fork(),
             **generation_params,
             **kwargs,
         )
@@ -102,20 +124,20 @@ class Conversation(BaseConversation):
         stop: list[str] | None = UNSET,
         **kwargs,
     ) -> Generator[ChainResponse, None, None]:
-        self.history.add_user_message(prompt, context)
-        history = self.history.copy(deep=True)
-        self.history.add_user_message("")
+        history, index, parts = self._begin_stream(prompt, context)
         generation_params = self._merge_generation_params(
             temperature, top_p, frequency_penalty, presence_penalty, max_completion_tokens, stop
         )
-        for chunk in self.chain.stream(
-            conversation_history=history,
-            **generation_params,
-            **kwargs,
-        ):
-            self.history[-1].content += chunk.content
-            yield chunk
-        self.history.add_assistant_message("")
+        try:
+            for chunk in self.chain.stream(
+                conversation_history=history,
+                **generation_params,
+                **kwargs,
+            ):
+                parts.append(chunk.content)
+                yield chunk
+        finally:
+            self._finish_stream(index, parts)
 
     async def astream(
         self,
@@ -130,16 +152,17 @@ class Conversation(BaseConversation):
         stop: list[str] | None = UNSET,
         **kwargs,
     ) -> AsyncGenerator[ChainResponse, None]:
-        self.history.add_user_message(prompt, context)
-        history = self.history.copy(deep=True)
-        self.history.add_assistant_message("")
+        history, index, parts = self._begin_stream(prompt, context)
         generation_params = self._merge_generation_params(
             temperature, top_p, frequency_penalty, presence_penalty, max_completion_tokens, stop
         )
-        async for chunk in self.chain.astream(
-            conversation_history=history,
-            **generation_params,
-            **kwargs,
-        ):
-            self.history[-1].content += chunk.content
-            yield chunk
+        try:
+            async for chunk in self.chain.astream(
+                conversation_history=history,
+                **generation_params,
+                **kwargs,
+            ):
+                parts.append(chunk.content)
+                yield chunk
+        finally:
+            self._finish_stream(index, parts)
@@ -1,7 +1,33 @@
 from .asr import ASRModel
 from .chain import Chain
+from .clients import HTTPClientOptions, OpenAIClientRegistry, openai_clients
 from .conversation import BaseConversation
+from .instrumentation import (
+    CallbackExporter,
+    InMemoryHistogramExporter,
+    MetricsExporter,
+    RequestMetrics,
+    instrumentation,
+)
 from .llm import BaseLLM
 from .objects import UNSET
+from .rate_limit import RateLimit, RateLimiter, rate_limiters
 
-__all__ = ["ASRModel", "BaseConversation", "BaseLLM", "Chain", "UNSET"]
+__all__ = [
+    "ASRModel",
+    "BaseConversation",
+    "BaseLLM",
+    "CallbackExporter",
+    "Chain",
+    "HTTPClientOptions",
+    "InMemoryHistogramExporter",
+    "MetricsExporter",
+    "OpenAIClientRegistry",
+    "RateLimit",
+    "RateLimiter",
+    "RequestMetrics",
+    "UNSET",
+    "instrumentation",
+    "openai_clients",
+    "rate_limiters",
+]
@@ -1,15 +1,33 @@
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator, Sequence
+from typing import Any
 
 from pydantic import BaseModel
 
-from .models import ASRResponse
+from .instrumentation import RequestMetrics, audio_bytes, instrument_methods
+from .models import ASRBatchResult, ASRResponse
 from .objects import UNSET
 
 
+def _attach_metrics(response: ASRResponse, metrics: RequestMetrics) -> None:
+    response.context.data["metrics"] = metrics.as_dict()
+
+
 class ASRModel(ABC, BaseModel):
     model_name: str = "default"
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        instrument_methods(
+            cls,
+            "bytes",
+            audio_bytes,
+            lambda response: len(response.text),
+            _attach_metrics,
+            ("transcribe", "atranscribe", "stream", "astream"),
+        )
+
     @abstractmethod
     def transcribe(
         self, audio: str | bytes, filetype: str, language: str = UNSET
@@ -30,6 +48,35 @@ class ASRModel(ABC, BaseModel):
         self, audio: str | bytes, filetype: str, language: str = UNSET
     ) -> Generator[ASRResponse, None, None]: ...
 
+    def _transcribe_item(
+        self, index: int, audio: str | bytes, filetype: str, language: str = UNSET
+    ) -> ASRBatchResult:
+        try:
+            return ASRBatchResult(index=index, response=self.transcribe(audio, filetype, language))
+        except Exception as e:
+            return ASRBatchResult(index=index, error=e)
+
+    async def _atranscribe_item(
+        self, index: int, audio: str | bytes, filetype: str, language: str = UNSET
+    ) -> ASRBatchResult:
+        try:
+            response = await self.atranscribe(audio, filetype, language)
+            return ASRBatchResult(index=index, response=response)
+        except Exception as e:
+            return ASRBatchResult(index=index, error=e)
+
+    def transcribe_many(
+        self, audios: Sequence[str | bytes], filetype: str, language: str = UNSET
+    ) -> Generator[ASRBatchResult, None, None]:
+        for index, audio in enumerate(audios):
+            yield self._transcribe_item(index, audio, filetype, language)
+
+    async def atranscribe_many(
+        self, audios: Sequence[str | bytes], filetype: str, language: str = UNSET
+    ) -> AsyncGenerator[ASRBatchResult, None]:
+        for index, audio in enumerate(audios):
+            yield await self._atranscribe_item(index, audio, filetype, language)
+
     class Config:
         use_enum_values = True
         arbitrary_types_allowed = True
@@ -1,15 +1,32 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
+from .instrumentation import RequestMetrics, history_chars, instrument_methods
 from .models import ChainResponse, ConversationHistory
 
 
+def _attach_metrics(response: ChainResponse, metrics: RequestMetrics) -> None:
+    response.metadata["metrics"] = metrics.as_dict()
+
+
 class Chain(ABC, BaseModel):
     chain: Optional["Chain"] = None
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        instrument_methods(
+            cls,
+            "chars",
+            history_chars,
+            lambda response: len(response.content),
+            _attach_metrics,
+            ("generate", "agenerate", "stream", "astream"),
+        )
+
     @abstractmethod
     def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse: ...
 
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+
+class HTTPClientOptions(BaseModel):
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry: float | None = Field(default=30.0, ge=0)
+    timeout: float | None = Field(default=None, gt=0)
+
+    def httpx_kwargs(self) -> dict[str, Any]:
+        import httpx
+
+        kwargs: dict[str, Any] = {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        }
+        if self.timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(self.timeout)
+        return kwargs
+
+    class Config:
+        frozen = True
+
+
+async def _aclose_all(http_clients: list["httpx.AsyncClient"]) -> None:
+    for http_client in http_clients:
+        await http_client.aclose()
+
+
+ClientKey = tuple[str, str | None, HTTPClientOptions]
+
+
+class OpenAIClientRegistry:
+    def __init__(self) -> None:
+        self._http_clients: dict[HTTPClientOptions, httpx.Client] = {}
+        self._clients: dict[ClientKey, OpenAI] = {}
+        self._async_http_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[HTTPClientOptions, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[ClientKey, AsyncOpenAI]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_client(self, api_key: str, host: str | None, options: HTTPClientOptions) -> "OpenAI":
+        key = (api_key, host, options)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        from openai import DefaultHttpxClient, OpenAI
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                http_client = self._http_clients.get(options)
+                if http_client is None:
+                    http_client = DefaultHttpxClient(**options.httpx_kwargs())
+                    self._http_clients[options] = http_client
+                client = OpenAI(api_key=api_key, base_url=host, http_client=http_client)
+                self._clients[key] = client
+            return client
+
+    def get_async_client(
+        self, api_key: str, host: str | None, options: HTTPClientOptions
+    ) -> "AsyncOpenAI":
+        loop = asyncio.get_running_loop()
+        key = (api_key, host, options)
+        clients = self._async_clients.get(loop)
+        client = None if clients is None else clients.get(key)
+        if client is not None:
+            return client
+
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                http_clients = self._async_http_clients.setdefault(loop, {})
+                http_client = http_clients.get(options)
+                if http_client is None:
+                    http_client = DefaultAsyncHttpxClient(**options.httpx_kwargs())
+                    http_clients[options] = http_client
+                client = AsyncOpenAI(api_key=api_key, base_url=host, http_client=http_client)
+                clients[key] = client
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            async_http_clients = list(self._async_http_clients.items())
+            self._http_clients.clear()
+            self._clients.clear()
+            self._async_http_clients.clear()
+            self._async_clients.clear()
+        for http_client in http_clients:
+            http_client.close()
+        for loop, clients in async_http_clients:
+            closing = _aclose_all(list(clients.values()))
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(closing, loop)
+            elif not loop.is_closed():
+                loop.run_until_complete(closing)
+            else:
+                closing.close()
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            http_clients = self._async_http_clients.pop(loop, {})
+            self._async_clients.pop(loop, None)
+        for http_client in http_clients.values():
+            await http_client.aclose()
+
+
+openai_clients = OpenAIClientRegistry()
@@ -0,0 +1,386 @@
+import bisect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+
+
+class RequestMetrics:
+    __slots__ = (
+        "chunks",
+        "component",
+        "ended",
+        "error",
+        "first_chunk",
+        "input_unit",
+        "operation",
+        "phases",
+        "queue_wait",
+        "size_in",
+        "size_out",
+        "started",
+    )
+
+    def __init__(self, component: str, operation: str, input_unit: str) -> None:
+        self.component = component
+        self.operation = operation
+        self.input_unit = input_unit
+        self.started = time.monotonic()
+        self.first_chunk: float | None = None
+        self.ended: float | None = None
+        self.chunks = 0
+        self.size_in: int | None = None
+        self.size_out = 0
+        self.queue_wait: float | None = None
+        self.error: str | None = None
+        self.phases: dict[str, float] = {}
+
+    @property
+    def name(self) -> str:
+        return f"{self.component}.{self.operation}"
+
+    @property
+    def latency(self) -> float | None:
+        return None if self.ended is None else self.ended - self.started
+
+    @property
+    def ttfc(self) -> float | None:
+        return None if self.first_chunk is None else self.first_chunk - self.started
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "ttfc": self.ttfc,
+            "chunks": self.chunks,
+            f"{self.input_unit}_in": self.size_in,
+            "chars_out": self.size_out,
+            "queue_wait": self.queue_wait,
+            "phases": dict(self.phases),
+            "error": self.error,
+        }
+
+
+class MetricsExporter(ABC):
+    @abstractmethod
+    def export(self, metrics: RequestMetrics) -> None: ...
+
+
+class InMemoryHistogramExporter(MetricsExporter):
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self.max_samples = max_samples
+        self._samples: dict[tuple[str, str], deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.max_samples)
+        )
+        self._lock = threading.Lock()
+
+    def export(self, metrics: RequestMetrics) -> None:
+        values = {
+            "latency": metrics.latency,
+            "ttfc": metrics.ttfc,
+            "queue_wait": metrics.queue_wait,
+        }
+        values.update((f"phase.{phase}", duration) for phase, duration in metrics.phases.items())
+        with self._lock:
+            for metric, value in values.items():
+                if value is not None:
+                    self._samples[(metrics.name, metric)].append(value)
+
+    def samples(self, name: str, metric: str = "latency") -> list[float]:
+        with self._lock:
+            return list(self._samples.get((name, metric), ()))
+
+    def percentile(self, name: str, metric: str = "latency", q: float = 50) -> float | None:
+        values = sorted(self.samples(name, metric))
+        if not values:
+            return None
+        return values[min(int(len(values) * q / 100), len(values) - 1)]
+
+    def histogram(
+        self, name: str, metric: str = "latency", bounds: list[float] | None = None
+    ) -> dict[float, int]:
+        bounds = sorted(bounds or [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+        counts = [0] * (len(bounds) + 1)
+        for value in self.samples(name, metric):
+            counts[bisect.bisect_left(bounds, value)] += 1
+        return dict(zip([*bounds, float("inf")], counts))
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        with self._lock:
+            keys = list(self._samples)
+        result: dict[str, dict[str, dict[str, float]]] = defaultdict(dict)
+        for name, metric in keys:
+            values = self.samples(name, metric)
+            result[name][metric] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": self.percentile(name, metric, 50),
+                "p99": self.percentile(name, metric, 99),
+            }
+        return dict(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+class CallbackExporter(MetricsExporter):
+    def __init__(self, callback: Callable[[str, float, float, dict[str, Any]], None]) -> None:
+        self.callback = callback
+
+    def export(self, metrics: RequestMetrics) -> None:
+        attributes = {
+            key: value
+            for key, value in metrics.as_dict().items()
+            if key != "phases" and value is not None
+        }
+        attributes.update((f"phase.{phase}", value) for phase, value in metrics.phases.items())
+        self.callback(metrics.name, metrics.started, metrics.ended, attributes)
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        self.exporters: tuple[MetricsExporter, ...] = ()
+        self._current: ContextVar[RequestMetrics | None] = ContextVar(
+            "llmtoolkit_request_metrics", default=None
+        )
+        self._lock = threading.Lock()
+        self._phase_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: MetricsExporter) -> None:
+        with self._lock:
+            self.exporters = (*self.exporters, exporter)
+
+    def remove_exporter(self, exporter: MetricsExporter) -> None:
+        with self._lock:
+            self.exporters = tuple(item for item in self.exporters if item is not exporter)
+
+    def _emit(self, metrics: RequestMetrics) -> None:
+        metrics.ended = time.monotonic()
+        for exporter in self.exporters:
+            exporter.export(metrics)
+
+    def _call_in(self, metrics: RequestMetrics, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        token = self._current.set(metrics)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._current.reset(token)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        metrics = self._current.get() if self.exporters else None
+        if metrics is None:
+            yield
+            return
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._phase_lock:
+                metrics.phases[name] = metrics.phases.get(name, 0.0) + elapsed
+
+    def instrument(
+        self,
+        fn: Callable,
+        operation: str,
+        input_unit: str,
+        measure_input: Callable[[tuple, dict], int | None],
+        measure_output: Callable[[Any], int],
+        attach: Callable[[Any, RequestMetrics], None],
+    ) -> Callable:
+        def start(instance: Any, args: tuple, kwargs: dict) -> RequestMetrics:
+            metrics = RequestMetrics(type(instance).__name__, operation, input_unit)
+            metrics.size_in = measure_input(args, kwargs)
+            return metrics
+
+        def observe(metrics: RequestMetrics, result: Any) -> None:
+            if metrics.first_chunk is None:
+                metrics.first_chunk = time.monotonic()
+            metrics.chunks += 1
+            metrics.size_out += measure_output(result)
+            queue_wait = _queue_wait(result)
+            if queue_wait is not None:
+                metrics.queue_wait = queue_wait
+
+        def finish(metrics: RequestMetrics, last: Any, error: BaseException | None) -> None:
+            if error is not None:
+                metrics.error = type(error).__name__
+            self._emit(metrics)
+            if last is not None:
+                attach(last, metrics)
+
+        if operation in ("generate", "transcribe"):
+
+            @wraps(fn)
+            def call(instance, *args, **kwargs):
+                if not self.exporters:
+                    return fn(instance, *args, **kwargs)
+                metrics = start(instance, args, kwargs)
+                token = self._current.set(metrics)
+                result, error = None, None
+                try:
+                    result = fn(instance, *args, **kwargs)
+                    observe(metrics, result)
+                    return result
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    self._current.reset(token)
+                    finish(metrics, result, error)
+
+            return call
+
+        if operation in ("agenerate", "atranscribe"):
+
+            @wraps(fn)
+            async def acall(instance, *args, **kwargs):
+                if not self.exporters:
+                    return await fn(instance, *args, **kwargs)
+                metrics = start(instance, args, kwargs)
+                token = self._current.set(metrics)
+                result, error = None, None
+                try:
+                    result = await fn(instance, *args, **kwargs)
+                    observe(metrics, result)
+                    return result
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    self._current.reset(token)
+                    finish(metrics, result, error)
+
+            return acall
+
+        if operation == "stream":
+
+            def traced(metrics: RequestMetrics, source: Iterator) -> Iterator:
+                source = iter(source)
+                last, error = None, None
+                try:
+                    while True:
+                        token = self._current.set(metrics)
+                        try:
+                            chunk = next(source)
+                        except StopIteration:
+                            break
+                        finally:
+                            self._current.reset(token)
+                        last = chunk
+                        observe(metrics, last)
+                        yield last
+                except GeneratorExit:
+                    raise
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    token = self._current.set(metrics)
+                    try:
+                        if hasattr(source, "close"):
+                            source.close()
+                    finally:
+                        self._current.reset(token)
+                        finish(metrics, last, error)
+
+            @wraps(fn)
+            def stream(instance, *args, **kwargs):
+                if not self.exporters:
+                    return fn(instance, *args, **kwargs)
+                metrics = start(instance, args, kwargs)
+                return traced(metrics, self._call_in(metrics, fn, instance, *args, **kwargs))
+
+            return stream
+
+        async def atraced(metrics: RequestMetrics, source: AsyncIterator) -> AsyncIterator:
+            source = aiter(source)
+            last, error = None, None
+            try:
+                while True:
+                    token = self._current.set(metrics)
+                    try:
+                        chunk = await anext(source)
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        self._current.reset(token)
+                    last = chunk
+                    observe(metrics, last)
+                    yield last
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                token = self._current.set(metrics)
+                try:
+                    if hasattr(source, "aclose"):
+                        await source.aclose()
+                finally:
+                    self._current.reset(token)
+                    finish(metrics, last, error)
+
+        @wraps(fn)
+        def astream(instance, *args, **kwargs):
+            if not self.exporters:
+                return fn(instance, *args, **kwargs)
+            metrics = start(instance, args, kwargs)
+            return atraced(metrics, self._call_in(metrics, fn, instance, *args, **kwargs))
+
+        return astream
+
+
+def instrument_methods(
+    cls: type,
+    input_unit: str,
+    measure_input: Callable[[tuple, dict], int | None],
+    measure_output: Callable[[Any], int],
+    attach: Callable[[Any, RequestMetrics], None],
+    methods: tuple[str, ...],
+) -> None:
+    for method in methods:
+        fn = cls.__dict__.get(method)
+        if fn is None or getattr(fn, "__isabstractmethod__", False):
+            continue
+        wrapped = instrumentation.instrument(
+            fn, method, input_unit, measure_input, measure_output, attach
+        )
+        setattr(cls, method, wrapped)
+
+
+def _queue_wait(result: Any) -> float | None:
+    metadata = getattr(result, "metadata", None)
+    return metadata.get("queue_wait") if metadata else None
+
+
+def history_chars(args: tuple, kwargs: dict) -> int | None:
+    history = args[0] if args else kwargs.get("conversation_history")
+    if history is None:
+        return None
+    return sum(len(message.content) for message in history)
+
+
+def audio_bytes(args: tuple, kwargs: dict) -> int | None:
+    audio = args[0] if args else kwargs.get("audio")
+    if isinstance(audio, bytes):
+        return len(audio)
+    try:
+        return os.path.getsize(audio)
+    except (OSError, TypeError):
+        return None
+
+
+instrumentation = Instrumentation()
@@ -1,9 +1,74 @@
 from abc import ABC
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from pydantic import PrivateAttr
 
 from .chain import Chain
+from .instrumentation import instrumentation
+from .models import ConversationHistory
+from .rate_limit import RateLimit, RateLimiter, rate_limiters
 
 
 class BaseLLM(Chain, ABC):
     api_key: str = "-"
     host: str | None = None
     model_name: str = "default"
+    rate_limit: RateLimit | None = None
+
+    _rate_limiter: RateLimiter | None = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.rate_limit is not None:
+            self._rate_limiter = rate_limiters.get(self.api_key, self.host, self.rate_limit)
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
+    def _is_transient(self, error: Exception) -> bool:
+        import httpx
+
+        if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+            return True
+        status_code = getattr(error, "status_code", None)
+        return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+    def _queue_metadata(self, queue_wait: float) -> dict[str, float]:
+        return {} if self.rate_limit is None else {"queue_wait": queue_wait}
+
+    @staticmethod
+    def _dump(conversation_history: ConversationHistory) -> list[dict[str, Any]]:
+        with instrumentation.phase("dump"):
+            return conversation_history.dump()
+
+    @staticmethod
+    def _estimate_tokens(messages: list[dict[str, Any]], max_completion_tokens: int | None) -> int:
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        completion = max_completion_tokens if isinstance(max_completion_tokens, int) else 0
+        return prompt_chars // 4 + 4 * len(messages) + completion
+
+    @contextmanager
+    def _limited(
+        self, messages: list[dict[str, Any]], max_completion_tokens: int | None
+    ) -> Iterator[float]:
+        limiter = self.rate_limiter
+        if limiter is None:
+            yield 0.0
+            return
+        tokens = self._estimate_tokens(messages, max_completion_tokens)
+        with limiter.acquire(tokens) as wait:
+            yield wait
+
+    @asynccontextmanager
+    async def _alimited(
+        self, messages: list[dict[str, Any]], max_completion_tokens: int | None
+    ) -> AsyncIterator[float]:
+        limiter = self.rate_limiter
+        if limiter is None:
+            yield 0.0
+            return
+        tokens = self._estimate_tokens(messages, max_completion_tokens)
+        async with limiter.aacquire(tokens) as wait:
+            yield wait
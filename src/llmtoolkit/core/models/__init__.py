@@ -1,5 +1,6 @@
-from .asr import ASRResponse
+from .asr import ASRBatchResult, ASRResponse
 from .base import Context
+from .compact_history import CompactConversationHistory, CompactMessageStore
 from .history import (
     ChainResponse,
     ConversationHistory,
@@ -8,8 +9,11 @@ from .history import (
 )
 
 __all__ = [
+    "ASRBatchResult",
     "ASRResponse",
     "ChainResponse",
+    "CompactConversationHistory",
+    "CompactMessageStore",
     "Context",
     "ConversationHistory",
     "ConversationMessage",
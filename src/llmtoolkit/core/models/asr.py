@@ -1,5 +1,16 @@
+from pydantic import BaseModel
+
 from .base import ResponseWithContext
 
 
 class ASRResponse(ResponseWithContext):
     text: str
+
+
+class ASRBatchResult(BaseModel):
+    index: int
+    response: ASRResponse | None = None
+    error: Exception | None = None
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -0,0 +1,109 @@
+from array import array
+from collections.abc import Iterable, Iterator, MutableSequence
+from typing import Any
+
+from pydantic import Field, field_serializer, field_validator
+
+from llmtoolkit.core.enums import Roles
+
+from .history import ConversationHistory, ConversationMessage
+
+_role_names: list[str] = [role.value for role in Roles]
+_role_codes: dict[str, int] = {name: code for code, name in enumerate(_role_names)}
+
+
+def _role_code(role: str) -> int:
+    code = _role_codes.get(role)
+    if code is None:
+        code = _role_codes[role] = len(_role_names)
+        _role_names.append(role)
+    return code
+
+
+class CompactMessageStore(MutableSequence[ConversationMessage]):
+    __slots__ = ("_roles", "_contents", "_contexts", "_extras")
+
+    def __init__(self, messages: Iterable[ConversationMessage] = ()) -> None:
+        self._roles = array("B")
+        self._contents: list[str] = []
+        self._contexts: list[str | None] = []
+        self._extras: list[dict[str, Any] | None] = []
+        self.extend(messages)
+
+    def _build(self, index: int) -> ConversationMessage:
+        return ConversationMessage.model_construct(
+            role=_role_names[self._roles[index]],
+            content=self._contents[index],
+            context=self._contexts[index],
+            **(self._extras[index] or {}),
+        )
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __getitem__(self, index: int | slice) -> ConversationMessage | list[ConversationMessage]:
+        if isinstance(index, slice):
+            return [self._build(i) for i in range(*index.indices(len(self)))]
+        return self._build(range(len(self))[index])
+
+    def __setitem__(self, index: int, value: ConversationMessage) -> None:
+        self._roles[index] = _role_code(value.role)
+        self._contents[index] = value.content
+        self._contexts[index] = value.context
+        self._extras[index] = value.model_extra or None
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._roles[index]
+        del self._contents[index]
+        del self._contexts[index]
+        del self._extras[index]
+
+    def __iter__(self) -> Iterator[ConversationMessage]:
+        for index in range(len(self)):
+            yield self._build(index)
+
+    def insert(self, index: int, value: ConversationMessage) -> None:
+        self._roles.insert(index, _role_code(value.role))
+        self._contents.insert(index, value.content)
+        self._contexts.insert(index, value.context)
+        self._extras.insert(index, value.model_extra or None)
+
+    def copy(self) -> "CompactMessageStore":
+        copied = CompactMessageStore()
+        copied._roles = array("B", self._roles)
+        copied._contents = list(self._contents)
+        copied._contexts = list(self._contexts)
+        copied._extras = list(self._extras)
+        return copied
+
+    def dump(self) -> list[dict[str, Any]]:
+        return [
+            {"role": _role_names[role], "content": content, "context": context, **(extra or {})}
+            for role, content, context, extra in zip(
+                self._roles, self._contents, self._contexts, self._extras
+            )
+        ]
+
+
+class CompactConversationHistory(ConversationHistory):
+    messages: CompactMessageStore = Field(default_factory=CompactMessageStore)
+
+    @field_validator("messages", mode="before")
+    @classmethod
+    def _to_store(cls, value: Any) -> CompactMessageStore:
+        if isinstance(value, CompactMessageStore):
+            return value
+        return CompactMessageStore(ConversationMessage.model_validate(message) for message in value)
+
+    @field_serializer("messages")
+    def _serialize_messages(self, messages: CompactMessageStore) -> list[dict[str, Any]]:
+        return messages.dump()
+
+    def fork(self) -> "CompactConversationHistory":
+        return self.model_construct(messages=self.messages.copy())
+
+    def dump(self) -> list[dict[str, Any]]:
+        return self.messages.dump()
+
+    class Config:
+        arbitrary_types_allowed = True
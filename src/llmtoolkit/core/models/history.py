@@ -1,7 +1,7 @@
 from collections.abc import Iterator
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from llmtoolkit.core.enums import Roles
 
@@ -13,8 +13,24 @@ class ConversationMessage(BaseModel):
     content: str
     context: str | None = None
 
+    _dump_cache: dict[str, Any] | None = PrivateAttr(default=None)
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> "ConversationMessage":
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__pydantic_private__["_dump_cache"] = None
+        return copied
+
+    def dump(self) -> dict[str, Any]:
+        private = self.__pydantic_private__
+        if private["_dump_cache"] is None:
+            private["_dump_cache"] = self.model_dump()
+        return dict(private["_dump_cache"])
+
     class Config:
         extra = "allow"
+        frozen = True
 
 
 class ConversationHistory(BaseModel):
@@ -44,6 +60,14 @@ class ConversationHistory(BaseModel):
     def insert(self, index: int, value: ConversationMessage) -> None:
         self.messages.insert(index, value)
 
+    def fork(self) -> "ConversationHistory":
+        return self.model_construct(messages=list(self.messages))
+
+    def update_message(self, index: int, **fields: Any) -> ConversationMessage:
+        message = self[index].model_copy(update=fields)
+        self[index] = message
+        return message
+
     def add_message(
         self,
         role: Roles,
@@ -83,7 +107,7 @@ class ConversationHistory(BaseModel):
         self.insert(0, ConversationMessage(role=Roles.SYSTEM, content=content, context=context))
 
     def dump(self) -> list[dict[str, Any]]:
-        return self.model_dump().get("messages")
+        return [message.dump() for message in self.messages]
 
 
 class ChainResponse(ResponseWithContext):
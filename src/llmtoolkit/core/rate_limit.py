@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from pydantic import BaseModel, Field
+
+from llmtoolkit.exc import RateLimitConflictError
+
+
+class RateLimit(BaseModel):
+    requests_per_minute: int | None = Field(default=None, ge=1)
+    tokens_per_minute: int | None = Field(default=None, ge=1)
+    max_in_flight: int | None = Field(default=None, ge=1)
+
+    class Config:
+        frozen = True
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "level", "rate", "updated")
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, cost: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= cost
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+
+class RateLimiter:
+    def __init__(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self._requests = (
+            TokenBucket(limit.requests_per_minute) if limit.requests_per_minute else None
+        )
+        self._tokens = TokenBucket(limit.tokens_per_minute) if limit.tokens_per_minute else None
+        self._in_flight = 0
+        self._waiters: deque[Callable[[], None]] = deque()
+        self._lock = threading.Lock()
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        return {
+            "requests": self._waits,
+            "queue_wait_total": self._total_wait,
+            "queue_wait_max": self._max_wait,
+            "queue_wait_mean": self._total_wait / self._waits if self._waits else 0.0,
+        }
+
+    def _try_slot(self, waiter: Callable[[], None]) -> bool:
+        with self._lock:
+            if self.limit.max_in_flight is None:
+                return True
+            if self._in_flight < self.limit.max_in_flight and not self._waiters:
+                self._in_flight += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def _release_slot(self) -> None:
+        if self.limit.max_in_flight is None:
+            return
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft()()
+            else:
+                self._in_flight -= 1
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            delay = 0.0
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            return delay
+
+    def _record(self, wait: float) -> None:
+        with self._lock:
+            self._waits += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    @contextmanager
+    def acquire(self, tokens: int = 0) -> Iterator[float]:
+        started = time.monotonic()
+        event = threading.Event()
+        if not self._try_slot(event.set):
+            event.wait()
+        try:
+            delay = self._reserve(tokens)
+            if delay:
+                time.sleep(delay)
+            wait = time.monotonic() - started
+            self._record(wait)
+            yield wait
+        finally:
+            self._release_slot()
+
+    @asynccontextmanager
+    async def aacquire(self, tokens: int = 0) -> AsyncIterator[float]:
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        if not self._try_slot(wake):
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    handed_off = wake not in self._waiters
+                    if not handed_off:
+                        self._waiters.remove(wake)
+                if handed_off:
+                    self._release_slot()
+                raise
+        try:
+            delay = self._reserve(tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            wait = time.monotonic() - started
+            self._record(wait)
+            yield wait
+        finally:
+            self._release_slot()
+
+
+class RateLimiterRegistry:
+    def __init__(self) -> None:
+        self._limiters: dict[tuple[str, str | None], RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str, host: str | None, limit: RateLimit) -> RateLimiter:
+        key = (api_key, host)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = RateLimiter(limit)
+            elif limiter.limit != limit:
+                raise RateLimitConflictError(
+                    f"Rate limit {limit!r} conflicts with {limiter.limit!r}, "
+                    "which is already registered for this API key and host."
+                )
+            return limiter
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+
+
+rate_limiters = RateLimiterRegistry()
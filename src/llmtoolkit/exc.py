@@ -19,3 +19,11 @@ class UnsupportedFormatError(BaseLLMToolkitException):
 
 class FfmpegError(BaseLLMToolkitException):
     message: str = "Ffmpeg installation required."
+
+
+class PromptTemplateError(BaseLLMToolkitException):
+    message: str = "Invalid prompt template."
+
+
+class RateLimitConflictError(BaseLLMToolkitException):
+    message: str = "A different rate limit is already registered for this API key and host."
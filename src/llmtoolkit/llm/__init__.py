@@ -1,4 +1,18 @@
-from .mistralai import MistralaiLLM
-from .openai import OpenAILLM
+from typing import TYPE_CHECKING
 
-__all__ = ["MistralaiLLM", "OpenAILLM"]
+from llmtoolkit._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .balancer import LoadBalancedLLM
+    from .mistralai import MistralaiLLM
+    from .openai import OpenAILLM
+
+_LAZY_ATTRIBUTES = {
+    "LoadBalancedLLM": ".balancer",
+    "MistralaiLLM": ".mistralai",
+    "OpenAILLM": ".openai",
+}
+
+__all__ = ["LoadBalancedLLM", "MistralaiLLM", "OpenAILLM"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), _LAZY_ATTRIBUTES)
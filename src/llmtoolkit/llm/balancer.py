@@ -0,0 +1,215 @@
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from typing import Any, Literal
+
+from pydantic import Field, PrivateAttr
+
+from llmtoolkit.core import BaseLLM
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+
+class BackendState:
+    __slots__ = ("failures", "latency", "opened_at", "outstanding")
+
+    def __init__(self) -> None:
+        self.outstanding = 0
+        self.latency: float | None = None
+        self.failures = 0
+        self.opened_at: float | None = None
+
+
+class LoadBalancedLLM(BaseLLM):
+    backends: list[BaseLLM] = Field(min_length=1)
+    strategy: Literal["least_outstanding", "latency"] = "least_outstanding"
+    ewma_alpha: float = Field(default=0.2, gt=0, le=1)
+    failure_threshold: int = Field(default=3, ge=1)
+    recovery_timeout: float = Field(default=30.0, ge=0)
+    max_attempts: int | None = Field(default=None, ge=1)
+
+    _states: list[BackendState] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _turn: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._states = [BackendState() for _ in self.backends]
+
+    @property
+    def states(self) -> list[BackendState]:
+        return self._states
+
+    def _is_available(self, state: BackendState, now: float) -> bool:
+        return state.opened_at is None or now - state.opened_at >= self.recovery_timeout
+
+    def _score(self, index: int) -> tuple:
+        state = self._states[index]
+        rotation = (index - self._turn) % len(self._states)
+        if self.strategy == "latency":
+            return (state.latency or 0.0, state.outstanding, rotation)
+        return (state.outstanding, state.latency or 0.0, rotation)
+
+    def _acquire(self, tried: set[int]) -> int | None:
+        with self._lock:
+            now = time.monotonic()
+            untried = [index for index in range(len(self._states)) if index not in tried]
+            if not untried:
+                return None
+            available = [index for index in untried if self._is_available(self._states[index], now)]
+            if available:
+                index = min(available, key=self._score)
+            else:
+                index = min(untried, key=lambda index: self._states[index].opened_at)
+            self._turn += 1
+            self._states[index].outstanding += 1
+            return index
+
+    def _release(self, index: int, failed: bool = False) -> None:
+        with self._lock:
+            state = self._states[index]
+            state.outstanding -= 1
+            if failed:
+                state.failures += 1
+                if state.failures >= self.failure_threshold:
+                    state.opened_at = time.monotonic()
+
+    def _record(self, index: int, started: float) -> None:
+        with self._lock:
+            state = self._states[index]
+            elapsed = time.monotonic() - started
+            if state.latency is None:
+                state.latency = elapsed
+            else:
+                state.latency += self.ewma_alpha * (elapsed - state.latency)
+            state.failures = 0
+            state.opened_at = None
+
+    def _is_transient(self, error: Exception) -> bool:
+        return any(backend._is_transient(error) for backend in self.backends)
+
+    def _attempts(self) -> int:
+        return min(self.max_attempts or len(self.backends), len(self.backends))
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        tried: set[int] = set()
+        error: Exception | None = None
+        for _ in range(self._attempts()):
+            index = self._acquire(tried)
+            if index is None:
+                break
+            tried.add(index)
+            started = time.monotonic()
+            try:
+                response = self.backends[index].generate(conversation_history, **kwargs)
+            except Exception as e:
+                failed = self.backends[index]._is_transient(e)
+                self._release(index, failed=failed)
+                if not failed:
+                    raise
+                error = e
+                continue
+            self._record(index, started)
+            self._release(index)
+            return response
+        raise error
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        tried: set[int] = set()
+        error: Exception | None = None
+        for _ in range(self._attempts()):
+            index = self._acquire(tried)
+            if index is None:
+                break
+            tried.add(index)
+            started = time.monotonic()
+            try:
+                response = await self.backends[index].agenerate(conversation_history, **kwargs)
+            except Exception as e:
+                failed = self.backends[index]._is_transient(e)
+                self._release(index, failed=failed)
+                if not failed:
+                    raise
+                error = e
+                continue
+            self._record(index, started)
+            self._release(index)
+            return response
+        raise error
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        tried: set[int] = set()
+        error: Exception | None = None
+        for _ in range(self._attempts()):
+            index = self._acquire(tried)
+            if index is None:
+                break
+            tried.add(index)
+            started = time.monotonic()
+            pending: list[ChainResponse] | None = []
+            failed = False
+            try:
+                for chunk in self.backends[index].stream(conversation_history, **kwargs):
+                    if pending is not None:
+                        pending.append(chunk)
+                        if not chunk.content:
+                            continue
+                        self._record(index, started)
+                        yield from pending
+                        pending = None
+                        continue
+                    yield chunk
+            except Exception as e:
+                failed = self.backends[index]._is_transient(e)
+                if pending is None or not failed:
+                    raise
+                error = e
+                continue
+            finally:
+                self._release(index, failed=failed)
+            if pending is not None:
+                self._record(index, started)
+                yield from pending
+            return
+        raise error
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        tried: set[int] = set()
+        error: Exception | None = None
+        for _ in range(self._attempts()):
+            index = self._acquire(tried)
+            if index is None:
+                break
+            tried.add(index)
+            started = time.monotonic()
+            pending: list[ChainResponse] | None = []
+            failed = False
+            try:
+                async for chunk in self.backends[index].astream(conversation_history, **kwargs):
+                    if pending is not None:
+                        pending.append(chunk)
+                        if not chunk.content:
+                            continue
+                        self._record(index, started)
+                        for buffered in pending:
+                            yield buffered
+                        pending = None
+                        continue
+                    yield chunk
+            except Exception as e:
+                failed = self.backends[index]._is_transient(e)
+                if pending is None or not failed:
+                    raise
+                error = e
+                continue
+            finally:
+                self._release(index, failed=failed)
+            if pending is not None:
+                self._record(index, started)
+                for buffered in pending:
+                    yield buffered
+            return
+        raise error
@@ -6,6 +6,7 @@ from mistralai import UNSET as MISTRAL_UNSET
 from mistralai import Mistral as MistralClient
 from pydantic import PrivateAttr
 
+from llmtoolkit.core.instrumentation import instrumentation
 from llmtoolkit.core.llm import BaseLLM
 from llmtoolkit.core.models import (
     ChainResponse,
@@ -18,7 +19,8 @@ class MistralaiLLM(BaseLLM):
     _client: MistralClient = PrivateAttr()
 
     def model_post_init(self, __context: Any) -> None:
-        self._client = MistralClient(api_key=self.api_key)
+        super().model_post_init(__context)
+        self._client = MistralClient(api_key=self.api_key, server_url=self.host)
 
     def generate(
         self,
@@ -33,19 +35,24 @@ class MistralaiLLM(BaseLLM):
         **kwargs: Any,
     ) -> ChainResponse:
         conversation_history = conversation_history or ConversationHistory()
-        response = self._client.chat.complete(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_tokens=max_completion_tokens,
-            stop=stop,
-            **kwargs,
-        )
+        messages = self._dump(conversation_history)
+        with self._limited(messages, max_completion_tokens) as queue_wait:
+            with instrumentation.phase("network"):
+                response = self._client.chat.complete(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_tokens=max_completion_tokens,
+                    stop=stop,
+                    **kwargs,
+                )
         message = response.choices[0].message
-        return ChainResponse(content=message.content or "")
+        return ChainResponse(
+            content=message.content or "", metadata=self._queue_metadata(queue_wait)
+        )
 
     async def agenerate(
         self,
@@ -60,19 +67,24 @@ class MistralaiLLM(BaseLLM):
         **kwargs: Any,
     ) -> ChainResponse:
         conversation_history = conversation_history or ConversationHistory()
-        response = await self._client.chat.complete_async(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_tokens=max_completion_tokens,
-            stop=stop,
-            **kwargs,
-        )
+        messages = self._dump(conversation_history)
+        async with self._alimited(messages, max_completion_tokens) as queue_wait:
+            with instrumentation.phase("network"):
+                response = await self._client.chat.complete_async(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_tokens=max_completion_tokens,
+                    stop=stop,
+                    **kwargs,
+                )
         message = response.choices[0].message
-        return ChainResponse(content=message.content or "")
+        return ChainResponse(
+            content=message.content or "", metadata=self._queue_metadata(queue_wait)
+        )
 
     def stream(
         self,
@@ -87,20 +99,26 @@ class MistralaiLLM(BaseLLM):
         **kwargs: Any,
     ) -> Generator[ChainResponse, None, None]:
         conversation_history = conversation_history or ConversationHistory()
+        messages = self._dump(conversation_history)
         try:
-            for chunk in self._client.chat.stream(
-                model=self.model_name,
-                messages=conversation_history.dump(),
-                temperature=temperature,
-                top_p=top_p,
-                frequency_penalty=frequency_penalty,
-                presence_penalty=presence_penalty,
-                max_tokens=max_completion_tokens,
-                stop=stop,
-                **kwargs,
-            ):
-                message = chunk.data.choices[0].delta
-                yield ChainResponse(content=message.content or "")
+            with self._limited(messages, max_completion_tokens) as queue_wait:
+                metadata = self._queue_metadata(queue_wait)
+                with instrumentation.phase("network"):
+                    stream = self._client.chat.stream(
+                        model=self.model_name,
+                        messages=messages,
+                        temperature=temperature,
+                        top_p=top_p,
+                        frequency_penalty=frequency_penalty,
+                        presence_penalty=presence_penalty,
+                        max_tokens=max_completion_tokens,
+                        stop=stop,
+                        **kwargs,
+                    )
+                for chunk in stream:
+                    message = chunk.data.choices[0].delta
+                    yield ChainResponse(content=message.content or "", metadata=metadata)
+                    metadata = {}
         except httpx.ResponseNotRead:
             raise StreamReadError
 
@@ -117,19 +135,25 @@ class MistralaiLLM(BaseLLM):
         **kwargs: Any,
     ) -> AsyncGenerator[ChainResponse, None]:
         conversation_history = conversation_history or ConversationHistory()
+        messages = self._dump(conversation_history)
         try:
-            async for chunk in await self._client.chat.stream_async(
-                model=self.model_name,
-                messages=conversation_history.dump(),
-                temperature=temperature,
-                top_p=top_p,
-                frequency_penalty=frequency_penalty,
-                presence_penalty=presence_penalty,
-                max_tokens=max_completion_tokens,
-                stop=stop,
-                **kwargs,
-            ):
-                message = chunk.data.choices[0].delta
-                yield ChainResponse(content=message.content or "")
+            async with self._alimited(messages, max_completion_tokens) as queue_wait:
+                metadata = self._queue_metadata(queue_wait)
+                with instrumentation.phase("network"):
+                    stream = await self._client.chat.stream_async(
+                        model=self.model_name,
+                        messages=messages,
+                        temperature=temperature,
+                        top_p=top_p,
+                        frequency_penalty=frequency_penalty,
+                        presence_penalty=presence_penalty,
+                        max_tokens=max_completion_tokens,
+                        stop=stop,
+                        **kwargs,
+                    )
+                async for chunk in stream:
+                    message = chunk.data.choices[0].delta
+                    yield ChainResponse(content=message.content or "", metadata=metadata)
+                    metadata = {}
         except httpx.ResponseNotRead:
             raise StreamReadError
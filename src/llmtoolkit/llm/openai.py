@@ -1,10 +1,12 @@
 from collections.abc import AsyncGenerator, Generator
 from typing import Any
 
-from openai import NOT_GIVEN, AsyncOpenAI, OpenAI
-from pydantic import PrivateAttr
+from openai import NOT_GIVEN, APIConnectionError, AsyncOpenAI, OpenAI
+from pydantic import Field
 
 from llmtoolkit.core import BaseLLM
+from llmtoolkit.core.clients import HTTPClientOptions, openai_clients
+from llmtoolkit.core.instrumentation import instrumentation
 from llmtoolkit.core.models import (
     ChainResponse,
     ConversationHistory,
@@ -12,12 +14,18 @@ from llmtoolkit.core.models import (
 
 
 class OpenAILLM(BaseLLM):
-    _client: OpenAI = PrivateAttr()
-    _async_client: AsyncOpenAI = PrivateAttr()
+    http_options: HTTPClientOptions = Field(default_factory=HTTPClientOptions)
 
-    def model_post_init(self, __context: Any) -> None:
-        self._client = OpenAI(api_key=self.api_key, base_url=self.host)
-        self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.host)
+    @property
+    def client(self) -> OpenAI:
+        return openai_clients.get_client(self.api_key, self.host, self.http_options)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        return openai_clients.get_async_client(self.api_key, self.host, self.http_options)
+
+    def _is_transient(self, error: Exception) -> bool:
+        return isinstance(error, APIConnectionError) or super()._is_transient(error)
 
     def generate(
         self,
@@ -32,20 +40,24 @@ class OpenAILLM(BaseLLM):
         **kwargs: Any,
     ) -> ChainResponse:
         conversation_history = conversation_history or ConversationHistory()
-        response = self._client.chat.completions.create(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_completion_tokens=max_completion_tokens,
-            stop=stop,
-            **kwargs,
-        )
+        messages = self._dump(conversation_history)
+        with self._limited(messages, max_completion_tokens) as queue_wait:
+            with instrumentation.phase("network"):
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_completion_tokens=max_completion_tokens,
+                    stop=stop,
+                    **kwargs,
+                )
         message = response.choices[0].message
         return ChainResponse(
             content=message.content or "",
+            metadata=self._queue_metadata(queue_wait),
         )
 
     async def agenerate(
@@ -61,20 +73,24 @@ class OpenAILLM(BaseLLM):
         **kwargs: Any,
     ) -> ChainResponse:
         conversation_history = conversation_history or ConversationHistory()
-        response = await self._async_client.chat.completions.create(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_completion_tokens=max_completion_tokens,
-            stop=stop,
-            **kwargs,
-        )
+        messages = self._dump(conversation_history)
+        async with self._alimited(messages, max_completion_tokens) as queue_wait:
+            with instrumentation.phase("network"):
+                response = await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_completion_tokens=max_completion_tokens,
+                    stop=stop,
+                    **kwargs,
+                )
         message = response.choices[0].message
         return ChainResponse(
             content=message.content or "",
+            metadata=self._queue_metadata(queue_wait),
         )
 
     def stream(
@@ -90,23 +106,29 @@ class OpenAILLM(BaseLLM):
         **kwargs: Any,
     ) -> Generator[ChainResponse, None, None]:
         conversation_history = conversation_history or ConversationHistory()
-        stream = self._client.chat.completions.create(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_completion_tokens=max_completion_tokens,
-            stop=stop,
-            stream=True,
-            **kwargs,
-        )
-        for chunk in stream:
-            delta = chunk.choices[0].delta
-            yield ChainResponse(
-                content=delta.content or "",
-            )
+        messages = self._dump(conversation_history)
+        with self._limited(messages, max_completion_tokens) as queue_wait:
+            with instrumentation.phase("network"):
+                stream = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_completion_tokens=max_completion_tokens,
+                    stop=stop,
+                    stream=True,
+                    **kwargs,
+                )
+            metadata = self._queue_metadata(queue_wait)
+            for chunk in stream:
+                delta = chunk.choices[0].delta
+                yield ChainResponse(
+                    content=delta.content or "",
+                    metadata=metadata,
+                )
+                metadata = {}
 
     async def astream(
         self,
@@ -121,19 +143,26 @@ class OpenAILLM(BaseLLM):
         **kwargs: Any,
     ) -> AsyncGenerator[ChainResponse, None]:
         conversation_history = conversation_history or ConversationHistory()
-        async for chunk in await self._async_client.chat.completions.create(
-            model=self.model_name,
-            messages=conversation_history.dump(),
-            temperature=temperature,
-            top_p=top_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            max_completion_tokens=max_completion_tokens,
-            stop=stop,
-            stream=True,
-            **kwargs,
-        ):
-            delta = chunk.choices[0].delta
-            yield ChainResponse(
-                content=delta.content or "",
-            )
+        messages = self._dump(conversation_history)
+        async with self._alimited(messages, max_completion_tokens) as queue_wait:
+            metadata = self._queue_metadata(queue_wait)
+            with instrumentation.phase("network"):
+                stream = await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    top_p=top_p,
+                    frequency_penalty=frequency_penalty,
+                    presence_penalty=presence_penalty,
+                    max_completion_tokens=max_completion_tokens,
+                    stop=stop,
+                    stream=True,
+                    **kwargs,
+                )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta
+                yield ChainResponse(
+                    content=delta.content or "",
+                    metadata=metadata,
+                )
+                metadata = {}
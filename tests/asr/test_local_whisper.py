@@ -0,0 +1,173 @@
+import gc
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+
+from llmtoolkit.asr import LocalWhisper, local_whisper
+from llmtoolkit.asr.model_registry import WhisperModelRegistry
+
+
+def test_thread_executor_rejects_multiple_workers():
+    with pytest.raises(ValidationError, match="executor='process'"):
+        LocalWhisper(model_name="tiny", executor="thread", max_workers=2)
+
+
+def test_process_executor_allows_multiple_workers():
+    whisper = LocalWhisper(model_name="tiny", executor="process", max_workers=2)
+
+    assert whisper.max_workers == 2
+
+
+class FakeParameter:
+    def numel(self) -> int:
+        return 1_000
+
+    def element_size(self) -> int:
+        return 4
+
+
+class FakeModel:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def parameters(self) -> list[FakeParameter]:
+        return [FakeParameter()]
+
+    def transcribe(self, samples, language=None) -> dict:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        return {"text": " hello "}
+
+
+class FakeLoader:
+    def __init__(self) -> None:
+        self.loads = []
+        self.gates: dict[str, threading.Event] = {}
+
+    def load_model(self, name: str, device: str | None = None) -> FakeModel:
+        self.loads.append(name)
+        if name in self.gates:
+            self.gates[name].wait(5)
+        if name == "broken":
+            raise RuntimeError("broken")
+        return FakeModel()
+
+
+@pytest.fixture
+def loader(monkeypatch: pytest.MonkeyPatch) -> FakeLoader:
+    loader = FakeLoader()
+    monkeypatch.setitem(sys.modules, "whisper", types.SimpleNamespace(load_model=loader.load_model))
+    return loader
+
+
+@pytest.fixture
+def registry(loader: FakeLoader, monkeypatch: pytest.MonkeyPatch) -> WhisperModelRegistry:
+    registry = WhisperModelRegistry(memory_budget=0)
+    monkeypatch.setattr(local_whisper, "model_registry", registry)
+    return registry
+
+
+def test_instances_share_one_model(registry: WhisperModelRegistry):
+    first, second = LocalWhisper(model_name="tiny"), LocalWhisper(model_name="tiny")
+
+    assert first._get_model() is second._get_model()
+    assert registry.refcount("tiny") == 2
+
+
+def test_shared_model_inference_is_serialized(registry: WhisperModelRegistry):
+    instances = [LocalWhisper(model_name="tiny") for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=len(instances)) as pool:
+        texts = list(pool.map(lambda whisper: whisper._transcribe_samples(None), instances * 3))
+
+    assert texts == ["hello"] * 12
+    assert instances[0]._get_model().model.max_in_flight == 1
+
+
+def test_garbage_collected_instance_releases_model(registry: WhisperModelRegistry):
+    whisper = LocalWhisper(model_name="tiny")
+    whisper._transcribe_samples(None)
+    assert registry.refcount("tiny") == 1
+
+    del whisper
+    gc.collect()
+
+    assert registry.refcount("tiny") == 0
+    assert registry.memory_usage == 0
+    assert ("tiny", None) not in registry._models
+
+
+def test_close_releases_model_once(registry: WhisperModelRegistry):
+    whisper = LocalWhisper(model_name="tiny")
+    whisper._get_model()
+    other = LocalWhisper(model_name="tiny")
+    other._get_model()
+
+    whisper.close()
+    whisper.close()
+    del whisper
+    gc.collect()
+
+    assert registry.refcount("tiny") == 1
+
+
+def test_slow_load_does_not_block_loaded_models(registry: WhisperModelRegistry, loader: FakeLoader):
+    registry.acquire("tiny")
+    loader.gates["large"] = gate = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        loading = pool.submit(registry.acquire, "large")
+        while "large" not in loader.loads:
+            time.sleep(0.001)
+        registry.acquire("tiny")
+        registry.release("tiny")
+        assert not loading.done()
+        gate.set()
+        assert loading.result().refcount == 1
+
+    assert registry.refcount("tiny") == 1
+
+
+def test_concurrent_acquires_load_once(registry: WhisperModelRegistry, loader: FakeLoader):
+    loader.gates["tiny"] = gate = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        acquires = [pool.submit(registry.acquire, "tiny") for _ in range(4)]
+        time.sleep(0.05)
+        gate.set()
+        models = {id(acquire.result()) for acquire in acquires}
+
+    assert loader.loads == ["tiny"]
+    assert len(models) == 1
+    assert registry.refcount("tiny") == 4
+
+
+def test_failed_load_is_not_cached(registry: WhisperModelRegistry, loader: FakeLoader):
+    with pytest.raises(RuntimeError):
+        registry.acquire("broken")
+    with pytest.raises(RuntimeError):
+        registry.acquire("broken")
+
+    assert loader.loads == ["broken", "broken"]
+
+
+def test_release_later_never_blocks(registry: WhisperModelRegistry):
+    registry.acquire("tiny")
+
+    with registry._lock:
+        registry.release_later("tiny")
+        assert registry.refcount("tiny") == 1
+
+    registry.acquire("other")
+    assert registry.refcount("tiny") == 0
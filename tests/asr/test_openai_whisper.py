@@ -0,0 +1,232 @@
+import json
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+import pytest
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from llmtoolkit.asr import OpenAIWhisper
+
+CHUNKS = 8
+CHUNK_DELAY = 0.05
+PIPE_FORMATS = ("mp3", "ogg", "flac", "webm")
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is required")
+
+
+class TranscriptionStub:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Request) -> Response:
+        index = int(request.files["file"].filename.split("_")[1].split(".")[0])
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(CHUNK_DELAY * (CHUNKS - index))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return Response(json.dumps({"text": f"part{index}"}), content_type="application/json")
+
+
+@pytest.fixture
+def stub(threaded_httpserver: HTTPServer) -> TranscriptionStub:
+    stub = TranscriptionStub()
+    threaded_httpserver.expect_request(
+        "/v1/audio/transcriptions", method="POST"
+    ).respond_with_handler(stub)
+    return stub
+
+
+@pytest.fixture
+def whisper(threaded_httpserver: HTTPServer, monkeypatch: pytest.MonkeyPatch) -> OpenAIWhisper:
+    def prepare_audio_chunks(self, audio, filetype):
+        chunks = [(f"chunk_{index}.{filetype}", audio) for index in range(CHUNKS)]
+        bounds = [(index * 10.0, (index + 1) * 10.0) for index in range(CHUNKS)]
+        return chunks, bounds, []
+
+    monkeypatch.setattr(OpenAIWhisper, "_prepare_audio_chunks", prepare_audio_chunks)
+    return OpenAIWhisper(
+        api_key="test",
+        host=threaded_httpserver.url_for("/v1"),
+        model_name="whisper-1",
+        max_concurrency=3,
+    )
+
+
+EXPECTED = " ".join(f"part{index}" for index in range(CHUNKS))
+SEQUENTIAL_TIME = sum(CHUNK_DELAY * (CHUNKS - index) for index in range(CHUNKS))
+
+
+def test_transcribe_keeps_chunk_order(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    started = time.perf_counter()
+    response = whisper.transcribe(b"audio", "wav")
+    elapsed = time.perf_counter() - started
+
+    assert response.text == EXPECTED
+    assert stub.requests == CHUNKS
+    assert elapsed < SEQUENTIAL_TIME * 0.75
+
+
+def test_transcribe_bounds_concurrency(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    whisper.transcribe(b"audio", "wav")
+
+    assert stub.max_in_flight == whisper.max_concurrency
+
+
+def test_stream_yields_chunks_in_order(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    responses = list(whisper.stream(b"audio", "wav"))
+
+    assert [response.text for response in responses] == EXPECTED.split()
+    assert [response.context.data["start_time"] for response in responses] == [
+        index * 10.0 for index in range(CHUNKS)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_atranscribe_keeps_chunk_order(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    started = time.perf_counter()
+    response = await whisper.atranscribe(b"audio", "wav")
+    elapsed = time.perf_counter() - started
+
+    assert response.text == EXPECTED
+    assert stub.requests == CHUNKS
+    assert elapsed < SEQUENTIAL_TIME * 0.75
+
+
+@pytest.mark.asyncio
+async def test_atranscribe_bounds_concurrency(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    await whisper.atranscribe(b"audio", "wav")
+
+    assert stub.max_in_flight == whisper.max_concurrency
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_chunks_in_order(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    responses = [response async for response in whisper.astream(b"audio", "wav")]
+
+    assert [response.text for response in responses] == EXPECTED.split()
+
+
+def test_transcribe_many_shares_concurrency_limit(whisper: OpenAIWhisper, stub: TranscriptionStub):
+    results = list(whisper.transcribe_many([b"first", b"second"], "wav"))
+
+    assert sorted(result.index for result in results) == [0, 1]
+    assert [result.response.text for result in results] == [EXPECTED, EXPECTED]
+    assert stub.requests == 2 * CHUNKS
+    assert stub.max_in_flight == whisper.max_concurrency
+
+
+@pytest.mark.asyncio
+async def test_atranscribe_many_shares_concurrency_limit(
+    whisper: OpenAIWhisper, stub: TranscriptionStub
+):
+    results = [result async for result in whisper.atranscribe_many([b"first", b"second"], "wav")]
+
+    assert sorted(result.index for result in results) == [0, 1]
+    assert [result.response.text for result in results] == [EXPECTED, EXPECTED]
+    assert stub.requests == 2 * CHUNKS
+    assert stub.max_in_flight == whisper.max_concurrency
+
+
+def encode_sine(filetype: str, seconds: float) -> bytes:
+    return subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "quiet",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=16000:duration={seconds}",
+            "-f",
+            filetype,
+            "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("filetype", PIPE_FORMATS)
+def test_transcribe_bytes_through_pipes(filetype: str, threaded_httpserver: HTTPServer):
+    threaded_httpserver.expect_request("/v1/audio/transcriptions", method="POST").respond_with_json(
+        {"text": "hello"}
+    )
+    data = encode_sine(filetype, 30)
+    whisper = OpenAIWhisper(
+        api_key="test", host=threaded_httpserver.url_for("/v1"), model_name="whisper-1"
+    )
+    whisper._max_file_size = len(data) // 3
+
+    chunks, bounds, temp_files = whisper._prepare_audio_chunks(data, filetype)
+    assert temp_files == []
+    assert len(chunks) == len(bounds) > 1
+    assert all(chunk for _, chunk in chunks)
+    assert bounds[-1][1] == pytest.approx(30, abs=0.1)
+
+    responses = list(whisper.stream(data, filetype))
+    assert len(responses) == len(bounds)
+    assert len(threaded_httpserver.log) == len(bounds)
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("filetype", PIPE_FORMATS)
+def test_short_bytes_are_uploaded_as_is(filetype: str):
+    data = encode_sine(filetype, 5)
+    whisper = OpenAIWhisper(api_key="test", model_name="whisper-1")
+
+    chunks, bounds, temp_files = whisper._prepare_audio_chunks(data, filetype)
+    assert chunks == [(f"audio.{filetype}", data)]
+    assert bounds[0][1] == pytest.approx(5, abs=0.1)
+    assert temp_files == []
+
+
+@requires_ffmpeg
+def test_wav_is_split_through_temp_files(tmp_path):
+    source = tmp_path / "source.wav"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "quiet",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440:sample_rate=16000:duration=30",
+            str(source),
+        ],
+        check=True,
+    )
+    whisper = OpenAIWhisper(api_key="test", model_name="whisper-1")
+    whisper._max_file_size = source.stat().st_size // 3
+
+    chunks, bounds, temp_files = whisper._prepare_audio_chunks(str(source), "wav")
+    try:
+        assert len(chunks) == len(bounds) > 1
+        for chunk, (start_time, end_time) in zip(chunks, bounds):
+            with wave.open(chunk) as audio:
+                seconds = audio.getnframes() / audio.getframerate()
+            assert seconds == pytest.approx(end_time - start_time, abs=0.1)
+    finally:
+        whisper._cleanup_files(temp_files)
+
+
+def test_pipes_are_posix_only(monkeypatch: pytest.MonkeyPatch):
+    whisper = OpenAIWhisper(api_key="test", model_name="whisper-1")
+    assert whisper._can_pipe("mp3")
+    assert not whisper._can_pipe("wav")
+
+    monkeypatch.setattr("llmtoolkit.asr.openai_whisper.os.name", "nt")
+    assert not whisper._can_pipe("mp3")
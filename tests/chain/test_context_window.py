@@ -0,0 +1,83 @@
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+
+from llmtoolkit.chain import ContextWindowChain
+from llmtoolkit.core import Chain
+from llmtoolkit.core.enums import Roles
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+
+class StaticChain(Chain):
+    content: str = ""
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return ChainResponse(content=self.content)
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self.generate(conversation_history)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield self.generate(conversation_history)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        yield self.generate(conversation_history)
+
+
+def make_history(turns: int, system: str | None = None) -> ConversationHistory:
+    history = ConversationHistory()
+    if system is not None:
+        history.set_system_message(system)
+    for index in range(turns):
+        history.add_user_message(f"Question {index} about something rather long.")
+        history.add_assistant_message(f"Answer {index} with a few more details in it.")
+    history.add_user_message("Latest question?")
+    return history
+
+
+def history_tokens(chain: ContextWindowChain, history: ConversationHistory) -> int:
+    return sum(chain.count_tokens(message.content) for message in history)
+
+
+@pytest.mark.parametrize("system", [None, "You are helpful."])
+def test_summary_stays_within_budget(system: str | None):
+    chain = ContextWindowChain(
+        max_tokens=30, summarizer=StaticChain(content="Long summary sentence. " * 40)
+    )
+
+    history = chain._prepare(make_history(6, system))
+
+    assert history_tokens(chain, history) <= chain.max_tokens
+    assert history[0].role == Roles.SYSTEM.value
+    assert history[-1].content == "Latest question?"
+
+
+def test_short_summary_is_kept_whole():
+    chain = ContextWindowChain(max_tokens=60, summarizer=StaticChain(content="Short recap."))
+
+    history = chain._prepare(make_history(6, "You are helpful."))
+
+    assert history[0].content == "You are helpful.\n\nShort recap."
+    assert history_tokens(chain, history) <= chain.max_tokens
+
+
+def test_history_within_budget_is_untouched():
+    chain = ContextWindowChain(max_tokens=1_000, summarizer=StaticChain(content="unused"))
+    history = make_history(3, "You are helpful.")
+
+    assert chain._prepare(history.fork()).dump() == history.dump()
+
+
+@pytest.mark.asyncio
+async def test_async_summary_stays_within_budget():
+    chain = ContextWindowChain(
+        max_tokens=30, summarizer=StaticChain(content="Long summary sentence. " * 40)
+    )
+
+    history = await chain._aprepare(make_history(6, "You are helpful."))
+
+    assert history_tokens(chain, history) <= chain.max_tokens
@@ -0,0 +1,114 @@
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from pydantic import Field
+
+from llmtoolkit.chain.prompts import UserMessagePromptCoverChain
+from llmtoolkit.conversation import Conversation
+from llmtoolkit.core import Chain
+from llmtoolkit.core.models import ChainResponse, ConversationHistory, ConversationMessage
+
+
+class RecordingChain(Chain):
+    seen: list[ConversationHistory] = Field(default_factory=list)
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        self.seen.append(conversation_history)
+        return ChainResponse(content="ok")
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self.generate(conversation_history)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield self.generate(conversation_history)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        yield self.generate(conversation_history)
+
+
+def make_history(questions: list[str]) -> ConversationHistory:
+    history = ConversationHistory()
+    for question in questions:
+        history.add_user_message(question)
+        history.add_assistant_message(f"Answer to {question}")
+    return history
+
+
+def user_contents(history: ConversationHistory) -> list[str]:
+    return [message.content for message in history if message.role == "user"]
+
+
+def test_cache_evicts_least_recently_used():
+    chain = UserMessagePromptCoverChain(prompt="Q: {}", cache_size=2)
+
+    for content in ("a", "b", "a", "c"):
+        chain._wrap(content)
+
+    assert list(chain._wrapped) == ["a", "c"]
+
+
+def test_reuse_does_not_rewrap_after_eviction():
+    questions = [f"question {index}" for index in range(5)]
+    chain = UserMessagePromptCoverChain(prompt="Q: {}", cache_size=2)
+    history = make_history(questions)
+
+    chain._prepare(history)
+    chain._prepare(history)
+
+    assert user_contents(history) == [f"Q: {question}" for question in questions]
+
+
+def test_latest_only_reuse_does_not_rewrap():
+    chain = UserMessagePromptCoverChain(prompt="Q: {}", cache_size=1, latest_only=True)
+    history = make_history(["first", "second"])
+
+    chain._prepare(history)
+    chain._wrap("other")
+    chain._prepare(history)
+
+    assert user_contents(history) == ["first", "Q: second"]
+
+
+def test_forked_history_is_not_mutated():
+    chain = UserMessagePromptCoverChain(prompt="Q: {}")
+    history = make_history(["first", "second"])
+
+    wrapped = chain._prepare(history.fork())
+
+    assert user_contents(history) == ["first", "second"]
+    assert user_contents(wrapped) == ["Q: first", "Q: second"]
+
+
+def test_message_matching_a_wrapped_output_is_wrapped():
+    chain = UserMessagePromptCoverChain(prompt="Q: {}")
+    history = make_history(["first"])
+    chain._prepare(history)
+
+    history.add_user_message("Q: first")
+    chain._prepare(history)
+
+    assert user_contents(history) == ["Q: first", "Q: Q: first"]
+
+
+def test_conversation_wraps_each_message_once(monkeypatch: pytest.MonkeyPatch):
+    copies = []
+    model_copy = ConversationMessage.model_copy
+
+    def counting_copy(self: ConversationMessage, **kwargs) -> ConversationMessage:
+        copies.append(self.content)
+        return model_copy(self, **kwargs)
+
+    monkeypatch.setattr(ConversationMessage, "model_copy", counting_copy)
+    recorder = RecordingChain()
+    conversation = Conversation(chain=UserMessagePromptCoverChain(prompt="Q: {}", chain=recorder))
+
+    for index in range(20):
+        conversation.chat(f"question {index}")
+
+    assert copies == [f"question {index}" for index in range(20)]
+    assert user_contents(recorder.seen[-1]) == [f"Q: question {index}" for index in range(20)]
+    assert user_contents(conversation.history) == [f"question {index}" for index in range(20)]
@@ -0,0 +1,24 @@
+from collections.abc import Iterator
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from llmtoolkit.core import InMemoryHistogramExporter, instrumentation
+
+
+@pytest.fixture
+def threaded_httpserver() -> Iterator[HTTPServer]:
+    server = HTTPServer(threaded=True)
+    server.start()
+    yield server
+    server.clear()
+    if server.is_running():
+        server.stop()
+
+
+@pytest.fixture
+def metrics_exporter() -> Iterator[InMemoryHistogramExporter]:
+    exporter = InMemoryHistogramExporter()
+    instrumentation.add_exporter(exporter)
+    yield exporter
+    instrumentation.remove_exporter(exporter)
@@ -0,0 +1,76 @@
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from pydantic import ValidationError
+
+from llmtoolkit.conversation import Conversation
+from llmtoolkit.core import Chain
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+
+
+class EditingChain(Chain):
+    def _edit(self, conversation_history: ConversationHistory) -> ChainResponse:
+        message = conversation_history[-1]
+        message = conversation_history.update_message(-1, content=f"EDITED {message.content}")
+        return ChainResponse(content=message.content)
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self._edit(conversation_history)
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self._edit(conversation_history)
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield self._edit(conversation_history)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        yield self._edit(conversation_history)
+
+
+class MutatingChain(EditingChain):
+    def _edit(self, conversation_history: ConversationHistory) -> ChainResponse:
+        conversation_history[-1].content = "MUTATED"
+        return ChainResponse(content="ok")
+
+
+def contents(conversation: Conversation) -> list[str]:
+    return [message.content for message in conversation.history]
+
+
+def test_chat_keeps_history_when_chain_edits_messages():
+    conversation = Conversation(chain=EditingChain())
+
+    conversation.chat("hi")
+    conversation.chat("again")
+
+    assert contents(conversation) == ["hi", "EDITED hi", "again", "EDITED again"]
+
+
+@pytest.mark.asyncio
+async def test_achat_keeps_history_when_chain_edits_messages():
+    conversation = Conversation(chain=EditingChain())
+
+    await conversation.achat("hi")
+
+    assert contents(conversation) == ["hi", "EDITED hi"]
+
+
+def test_stream_keeps_history_when_chain_edits_messages():
+    conversation = Conversation(chain=EditingChain())
+
+    list(conversation.stream("hi"))
+
+    assert contents(conversation) == ["hi", "EDITED hi"]
+
+
+def test_in_place_mutation_is_rejected():
+    conversation = Conversation(chain=MutatingChain())
+
+    with pytest.raises(ValidationError):
+        conversation.chat("hi")
+
+    assert contents(conversation) == ["hi"]
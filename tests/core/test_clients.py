@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from llmtoolkit.core.clients import HTTPClientOptions, OpenAIClientRegistry
+
+OPTIONS = HTTPClientOptions()
+
+
+def test_clients_share_one_pool():
+    registry = OpenAIClientRegistry()
+
+    first = registry.get_client("first", None, OPTIONS)
+    second = registry.get_client("second", None, OPTIONS)
+
+    assert first is not second
+    assert first._client is second._client
+    assert registry.get_client("first", None, OPTIONS) is first
+    registry.close()
+
+
+def test_close_closes_async_pools_of_idle_loops():
+    registry = OpenAIClientRegistry()
+    loop = asyncio.new_event_loop()
+
+    async def get_client():
+        return registry.get_async_client("key", None, OPTIONS)
+
+    try:
+        client = loop.run_until_complete(get_client())
+        registry.close()
+        assert client._client.is_closed
+        assert len(registry._async_http_clients) == 0
+    finally:
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_async_pools_of_running_loop():
+    registry = OpenAIClientRegistry()
+    client = registry.get_async_client("key", None, OPTIONS)
+    sync_client = registry.get_client("key", None, OPTIONS)
+
+    registry.close()
+    for _ in range(100):
+        if client._client.is_closed:
+            break
+        await asyncio.sleep(0.01)
+
+    assert client._client.is_closed
+    assert sync_client._client.is_closed
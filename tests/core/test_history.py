@@ -0,0 +1,58 @@
+import pytest
+from pydantic import ValidationError
+
+from llmtoolkit.core.models import CompactConversationHistory, ConversationHistory
+
+
+def make_history(history: ConversationHistory) -> ConversationHistory:
+    history.set_system_message("system")
+    history.add_user_message("hi")
+    history.add_assistant_message("hello")
+    return history
+
+
+def test_dump_returns_copies():
+    history = make_history(ConversationHistory())
+    expected = history.dump()
+
+    history.dump()[0]["content"] = "changed"
+    history[1].dump()["role"] = "changed"
+
+    assert history.dump() == expected
+
+
+def test_dump_follows_updates():
+    history = make_history(ConversationHistory())
+    history.dump()
+
+    history.update_message(1, content="edited")
+
+    assert history.dump()[1]["content"] == "edited"
+
+
+def test_compact_dump_matches_default():
+    assert (
+        make_history(CompactConversationHistory()).dump()
+        == make_history(ConversationHistory()).dump()
+    )
+
+
+def test_compact_messages_reject_assignment():
+    history = make_history(CompactConversationHistory())
+
+    with pytest.raises(ValidationError):
+        history[1].content = "changed"
+    with pytest.raises(ValidationError):
+        next(iter(history)).content = "changed"
+
+    assert history[1].content == "hi"
+
+
+def test_compact_update_message_writes_back():
+    history = make_history(CompactConversationHistory())
+    fork = history.fork()
+
+    fork.update_message(1, content="edited")
+
+    assert fork[1].content == "edited"
+    assert history[1].content == "hi"
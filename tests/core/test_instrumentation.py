@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from llmtoolkit.core import Chain, InMemoryHistogramExporter, instrumentation
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+from llmtoolkit.llm import OpenAILLM
+
+
+class PhasedChain(Chain):
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        with instrumentation.phase("work"):
+            time.sleep(0.01)
+        return ChainResponse(content="done")
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        with instrumentation.phase("work"):
+            await asyncio.sleep(0.01)
+        return ChainResponse(content="done")
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        for content in ("a", "b"):
+            with instrumentation.phase("work"):
+                time.sleep(0.01)
+            yield ChainResponse(content=content)
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        for content in ("a", "b"):
+            with instrumentation.phase("work"):
+                await asyncio.sleep(0.01)
+            yield ChainResponse(content=content)
+
+
+def test_disabled_instrumentation_attaches_nothing():
+    response = PhasedChain().generate(ConversationHistory())
+
+    assert "metrics" not in response.metadata
+
+
+def test_generate_records_phases(metrics_exporter: InMemoryHistogramExporter):
+    response = PhasedChain().generate(ConversationHistory())
+
+    assert response.metadata["metrics"]["phases"]["work"] >= 0.01
+    assert len(metrics_exporter.samples("PhasedChain.generate", "phase.work")) == 1
+
+
+def test_stream_records_phases(metrics_exporter: InMemoryHistogramExporter):
+    chunks = list(PhasedChain().stream(ConversationHistory()))
+
+    metrics = chunks[-1].metadata["metrics"]
+    assert metrics["chunks"] == 2
+    assert metrics["phases"]["work"] >= 0.02
+    assert len(metrics_exporter.samples("PhasedChain.stream", "phase.work")) == 1
+
+
+@pytest.mark.asyncio
+async def test_astream_records_phases(metrics_exporter: InMemoryHistogramExporter):
+    chunks = [chunk async for chunk in PhasedChain().astream(ConversationHistory())]
+
+    metrics = chunks[-1].metadata["metrics"]
+    assert metrics["chunks"] == 2
+    assert metrics["phases"]["work"] >= 0.02
+
+
+def test_stream_closed_early_is_exported(metrics_exporter: InMemoryHistogramExporter):
+    stream = PhasedChain().stream(ConversationHistory())
+    next(stream)
+    stream.close()
+
+    assert len(metrics_exporter.samples("PhasedChain.stream")) == 1
+
+
+def test_llm_records_dump_and_network(
+    httpserver: HTTPServer, metrics_exporter: InMemoryHistogramExporter
+):
+    httpserver.expect_request("/v1/chat/completions", method="POST").respond_with_json(
+        {
+            "id": "test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "hello"},
+                }
+            ],
+        }
+    )
+    history = ConversationHistory()
+    history.add_user_message("hi")
+    llm = OpenAILLM(api_key="test", host=httpserver.url_for("/v1"), model_name="test")
+
+    response = llm.generate(history)
+
+    assert response.content == "hello"
+    assert set(response.metadata["metrics"]["phases"]) == {"dump", "network"}
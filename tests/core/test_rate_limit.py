@@ -0,0 +1,48 @@
+import pytest
+
+from llmtoolkit.core import RateLimit
+from llmtoolkit.core.rate_limit import RateLimiterRegistry
+from llmtoolkit.exc import RateLimitConflictError
+from llmtoolkit.llm import OpenAILLM
+
+
+def test_registry_shares_limiter_for_equal_limits():
+    registry = RateLimiterRegistry()
+
+    first = registry.get("key", None, RateLimit(requests_per_minute=60))
+    second = registry.get("key", None, RateLimit(requests_per_minute=60))
+
+    assert first is second
+
+
+def test_registry_rejects_conflicting_limit():
+    registry = RateLimiterRegistry()
+    registry.get("key", None, RateLimit(requests_per_minute=60))
+
+    with pytest.raises(RateLimitConflictError):
+        registry.get("key", None, RateLimit(requests_per_minute=60, max_in_flight=2))
+
+
+def test_registry_keeps_hosts_apart():
+    registry = RateLimiterRegistry()
+
+    first = registry.get("key", "http://a", RateLimit(requests_per_minute=60))
+    second = registry.get("key", "http://b", RateLimit(max_in_flight=2))
+
+    assert first is not second
+    assert second.limit.max_in_flight == 2
+
+
+def test_llm_instances_with_conflicting_limits_fail_at_construction():
+    first = OpenAILLM(api_key="conflict", rate_limit=RateLimit(requests_per_minute=60))
+
+    assert first.rate_limiter.limit.requests_per_minute == 60
+    with pytest.raises(RateLimitConflictError):
+        OpenAILLM(api_key="conflict", rate_limit=RateLimit(max_in_flight=2))
+
+
+def test_token_estimate_uses_dumped_messages():
+    messages = [{"role": "user", "content": "x" * 40}, {"role": "assistant", "content": ""}]
+
+    assert OpenAILLM._estimate_tokens(messages, 100) == 10 + 8 + 100
+    assert OpenAILLM._estimate_tokens(messages, None) == 10 + 8
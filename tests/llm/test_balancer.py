@@ -0,0 +1,126 @@
+from collections.abc import AsyncGenerator, Generator
+
+import httpx
+import openai
+import pytest
+
+from llmtoolkit.core import BaseLLM
+from llmtoolkit.core.models import ChainResponse, ConversationHistory
+from llmtoolkit.llm import LoadBalancedLLM, OpenAILLM
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FakeBackend(BaseLLM):
+    error: Exception | None = None
+    calls: int = 0
+
+    def _respond(self) -> ChainResponse:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return ChainResponse(content=self.model_name)
+
+    def generate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self._respond()
+
+    async def agenerate(self, conversation_history: ConversationHistory, **kwargs) -> ChainResponse:
+        return self._respond()
+
+    def stream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> Generator[ChainResponse, None, None]:
+        yield self._respond()
+
+    async def astream(
+        self, conversation_history: ConversationHistory, **kwargs
+    ) -> AsyncGenerator[ChainResponse, None]:
+        yield self._respond()
+
+
+def make_balancer(error: Exception) -> LoadBalancedLLM:
+    return LoadBalancedLLM(
+        backends=[FakeBackend(model_name="first", error=error), FakeBackend(model_name="second")],
+        failure_threshold=1,
+    )
+
+
+TRANSIENT_ERRORS = [
+    StatusError(429),
+    StatusError(503),
+    httpx.ConnectError("refused"),
+    httpx.ReadTimeout("timeout"),
+]
+CLIENT_ERRORS = [StatusError(400), StatusError(422), ValueError("bad parameter")]
+
+
+@pytest.mark.parametrize("error", TRANSIENT_ERRORS)
+def test_transient_errors_fail_over(error: Exception):
+    balancer = make_balancer(error)
+
+    assert balancer.generate(ConversationHistory()).content == "second"
+    assert balancer.states[0].failures == 1
+    assert balancer.states[0].opened_at is not None
+
+
+@pytest.mark.parametrize("error", CLIENT_ERRORS)
+def test_client_errors_are_raised_without_failover(error: Exception):
+    balancer = make_balancer(error)
+
+    with pytest.raises(type(error)):
+        balancer.generate(ConversationHistory())
+
+    assert balancer.backends[1].calls == 0
+    assert balancer.states[0].failures == 0
+    assert balancer.states[0].opened_at is None
+    assert balancer.states[0].outstanding == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", CLIENT_ERRORS)
+async def test_async_client_errors_are_raised_without_failover(error: Exception):
+    generating, streaming = make_balancer(error), make_balancer(error)
+
+    with pytest.raises(type(error)):
+        await generating.agenerate(ConversationHistory())
+    with pytest.raises(type(error)):
+        [chunk async for chunk in streaming.astream(ConversationHistory())]
+
+    for balancer in (generating, streaming):
+        assert balancer.backends[1].calls == 0
+        assert balancer.states[0].failures == 0
+
+
+def test_stream_client_error_is_raised_without_failover():
+    balancer = make_balancer(StatusError(400))
+
+    with pytest.raises(StatusError):
+        list(balancer.stream(ConversationHistory()))
+
+    assert balancer.backends[1].calls == 0
+    assert balancer.states[0].failures == 0
+
+
+def test_stream_transient_error_fails_over():
+    balancer = make_balancer(StatusError(502))
+
+    assert [chunk.content for chunk in balancer.stream(ConversationHistory())] == ["second"]
+    assert balancer.states[0].failures == 1
+
+
+def test_openai_connection_errors_are_transient():
+    llm = OpenAILLM(api_key="test", model_name="test")
+    request = httpx.Request("POST", "http://localhost/v1/chat/completions")
+
+    assert llm._is_transient(openai.APIConnectionError(request=request))
+    assert llm._is_transient(openai.APITimeoutError(request=request))
+    assert not llm._is_transient(
+        openai.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+    )
+    assert llm._is_transient(
+        openai.InternalServerError("down", response=httpx.Response(500, request=request), body=None)
+    )